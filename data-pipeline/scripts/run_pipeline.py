@@ -67,8 +67,8 @@ def load_all_data(hmd_dir: Path = None, un_dir: Path = None):
     # Prefer HMD over UN when both available
     new_un_births = un_births.join(hmd_births, on=['Country', 'Year', 'Month'], how='anti')
     all_births = pl.concat([hmd_births, new_un_births]).with_columns([
-        pl.col('Year').cast(pl.Int64),
-        pl.col('Month').cast(pl.Int64),
+        pl.col('Year').cast(pl.Int32),
+        pl.col('Month').cast(pl.Int8),
         pl.col('Births').cast(pl.Float64),
     ]).sort(['Country', 'Year', 'Month'])
     print(f"  Combined: {len(all_births)} total births records")
@@ -97,8 +97,8 @@ def load_all_data(hmd_dir: Path = None, un_dir: Path = None):
     # Prefer HMD/JPOP over UN
     new_un_pop = un_population.join(hmd_population, on=['Country', 'Year'], how='anti')
     all_population = pl.concat([hmd_population, new_un_pop]).with_columns([
-        pl.col('Year').cast(pl.Int64),
-        pl.col('Month').cast(pl.Int64),
+        pl.col('Year').cast(pl.Int32),
+        pl.col('Month').cast(pl.Int8),
         pl.col('childbearing_population').cast(pl.Float64),
     ]).sort(['Country', 'Year', 'Month'])
     print(f"  Combined: {len(all_population)} total population records")
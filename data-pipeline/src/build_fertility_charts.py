@@ -102,7 +102,6 @@ def build_monthly_fertility_rate_chart(births: pl.DataFrame, country_name: str,
     # rank months by average ratio to annual average fertility rate
     month_avg_ratios = births.groupby('Month')['seasonality_ratio_annual'].mean().reset_index()
     month_avg_ratios.columns = ['Month', 'avg_seasonality_ratio_annual']
-    month_avg_ratios = month_avg_ratios.sort_values('avg_seasonality_ratio_annual', ascending=False)
     # Identify months to highlight
     # Lowest total rank = best overall performer (highlight in red)
     # Highest total rank = worst overall performer (highlight in blue)
@@ -5,6 +5,7 @@ from .settings import (
     UN_DATA_DIR,
     STATES_DATA_DIR,
     OUTPUT_DIR,
+    CSV_CACHE_DIR,
     JSON_OUTPUT_DIR,
     FERTILITY_OUTPUT_DIR,
     SEASONALITY_OUTPUT_DIR,
@@ -52,6 +53,7 @@ from .countries import (
     CODE_TO_NAME,
     NAME_TO_CODE,
     EXCLUDED_COUNTRIES,
+    strip_country_name,
     normalize_country_name,
     get_country_slug,
 )
@@ -62,6 +64,7 @@ __all__ = [
     'UN_DATA_DIR',
     'STATES_DATA_DIR',
     'OUTPUT_DIR',
+    'CSV_CACHE_DIR',
     'JSON_OUTPUT_DIR',
     'FERTILITY_OUTPUT_DIR',
     'SEASONALITY_OUTPUT_DIR',
@@ -107,6 +110,7 @@ __all__ = [
     'CODE_TO_NAME',
     'NAME_TO_CODE',
     'EXCLUDED_COUNTRIES',
+    'strip_country_name',
     'normalize_country_name',
     'get_country_slug',
 ]
@@ -3,6 +3,7 @@ Country codes and labels for HMD data.
 """
 import unicodedata
 import re
+from functools import lru_cache
 from typing import NamedTuple
 
 
@@ -87,16 +88,37 @@ EXCLUDED_COUNTRIES: list[str] = [
 ]
 
 
+# Characters stripped from country names
+_NON_LETTER_RE = re.compile(r'[^a-zA-Z\s]')
+
+# ASCII equivalent of the normalization below: drop what the regex drops, map spaces to hyphens
+_ASCII_SLUG_TABLE = {
+    **{i: None for i in range(128) if _NON_LETTER_RE.fullmatch(chr(i))},
+    ord(' '): '-',
+}
+
+
+@lru_cache(maxsize=None)
+def strip_country_name(country_name: str) -> str:
+    """
+    Remove special characters and diacritics from a country name and replace
+    spaces with hyphens, keeping the original case (cached; the set of names is small).
+    """
+    if country_name.isascii():
+        # NFC is a no-op on ASCII, so a single translate does the same work
+        return country_name.translate(_ASCII_SLUG_TABLE)
+    country_name = unicodedata.normalize('NFC', country_name)
+    country_name = _NON_LETTER_RE.sub('', country_name)
+    return country_name.replace(' ', '-')
+
+
 def normalize_country_name(country_name: str) -> str:
     """
     Normalize a country name to a standard format for filenames.
     Remove special characters and diacritics.
     Replace spaces with hyphens.
     """
-    country_name = unicodedata.normalize('NFC', country_name)
-    country_name = re.sub(r'[^a-zA-Z\s]', '', country_name)
-    country_name = country_name.replace(' ', '-').lower()
-    return country_name
+    return strip_country_name(country_name).lower()
 
 
 def get_country_slug(country_name: str) -> str:
@@ -82,6 +82,10 @@ STATES_DATA_DIR = Path(os.environ.get('STATES_DATA_DIR', PROJECT_ROOT / 'state-l
 # Can be overridden via OUTPUT_DIR environment variable
 OUTPUT_DIR = Path(os.environ.get('OUTPUT_DIR', DATA_PIPELINE_ROOT / 'output'))
 
+# Parquet copies of parsed raw CSVs, reused until the source file changes
+# Can be overridden via CSV_CACHE_DIR environment variable
+CSV_CACHE_DIR = Path(os.environ.get('CSV_CACHE_DIR', OUTPUT_DIR / 'cache'))
+
 # JSON output directories
 JSON_OUTPUT_DIR = OUTPUT_DIR
 FERTILITY_OUTPUT_DIR = OUTPUT_DIR / 'fertility'
@@ -6,6 +6,7 @@ from .json_exporter import (
     export_conception_data,
     export_all_countries,
     compute_complete_years,
+    compute_complete_years_by_country,
     filter_countries_by_min_years,
     trim_leading_trailing_nulls,
 )
@@ -29,6 +30,7 @@ __all__ = [
     'export_conception_data',
     'export_all_countries',
     'compute_complete_years',
+    'compute_complete_years_by_country',
     'filter_countries_by_min_years',
     'trim_leading_trailing_nulls',
     # State exports
@@ -0,0 +1,235 @@
+"""
+Helpers shared by the country and state JSON exporters.
+
+Covers encoding and writing payloads, the frame preparation done before rows
+are built, and the process pool that runs the per-country / per-state exports.
+"""
+import multiprocessing
+import os
+from pathlib import Path
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import orjson
+import polars as pl
+
+
+# Columns read by the per-country and per-state JSON exports; everything else is
+# dropped before the births frame is handed to the export workers.
+EXPORT_COLUMNS = [
+    'Country',
+    'Year',
+    'Month',
+    'Births',
+    'childbearing_population',
+    'Source',
+    'daily_fertility_rate',
+    'seasonality_percentage_normalized',
+    'daily_conception_rate',
+    'future_births',
+]
+
+
+def _generated_at() -> str:
+    """UTC timestamp (second precision, 'Z' suffix) stamped into exported files as generatedAt."""
+    return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace('+00:00', 'Z')
+
+
+def _encode_json(data: Any, indent: bool = False) -> bytes:
+    """Encode data to JSON bytes with orjson."""
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+
+
+def _write_bytes(path: Path, payload: bytes) -> None:
+    """Write pre-encoded bytes to path with a raw file descriptor, skipping Python's buffered IO."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def _write_mirror(source: Path, mirror: Path, payload: bytes) -> None:
+    """
+    Mirror an already-written file by hardlinking it, so the bytes hit the disk once.
+
+    Falls back to writing payload when hardlinks are unsupported (e.g. across filesystems).
+    """
+    try:
+        mirror.unlink(missing_ok=True)
+        os.link(source, mirror)
+    except OSError:
+        _write_bytes(mirror, payload)
+
+
+def _write_json(path: Path, data: Any, indent: bool = False) -> None:
+    """Encode data with orjson and write the bytes to path."""
+    _write_bytes(path, _encode_json(data, indent))
+
+
+def _trim_frame(frame: pl.DataFrame, value_col: str) -> pl.DataFrame:
+    """
+    Sort by (Year, Month) and drop leading and trailing rows where value_col is null.
+
+    Nulls between the first and last valid value are kept. If value_col has no
+    valid values, an empty frame with the same schema is returned. Trimming the
+    frame before the data cells are built means no dicts are made for the
+    dropped rows.
+    """
+    frame = frame.sort(['Year', 'Month'])
+    valid_idx = frame[value_col].is_not_null().arg_true()
+    if len(valid_idx) == 0:
+        return frame.clear()
+    first, last = valid_idx[0], valid_idx[-1]
+    return frame.slice(first, last - first + 1)
+
+
+def _fertility_rows(data: pl.DataFrame) -> List[Dict[str, Any]]:
+    """Build fertility data cells, rounding and casting with Polars before assembling dicts."""
+    columns = data.select(
+        pl.col('Year').cast(pl.Int64),
+        pl.col('Month').cast(pl.Int64),
+        pl.col('daily_fertility_rate').round(2),
+        pl.col('Births').cast(pl.Int64, strict=False),
+        pl.col('childbearing_population').cast(pl.Int64, strict=False),
+        pl.col('Source'),
+    ).get_columns()
+    return [
+        {
+            'year': year,
+            'month': month,
+            'value': value,
+            'births': births_count,
+            'population': population,
+            'source': source
+        }
+        for year, month, value, births_count, population, source in zip(*(c.to_list() for c in columns))
+    ]
+
+
+def _seasonality_rows(data: pl.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Build seasonality data cells, rounding with Polars before assembling dicts.
+
+    formattedValue is formatted in Python from the unrounded value, so ties round
+    the way f"{x:.1f}" does (Polars' round() differs, e.g. 0.0545 -> 5.4% vs 5.5%).
+    """
+    seasonality = pl.col('seasonality_percentage_normalized')
+    columns = data.select(
+        pl.col('Year').cast(pl.Int64),
+        pl.col('Month').cast(pl.Int64),
+        seasonality.round(4).alias('value'),
+        seasonality.alias('raw'),
+        pl.col('Source'),
+    ).get_columns()
+    return [
+        {
+            'year': year,
+            'month': month,
+            'value': value,
+            'formattedValue': f"{raw * 100:.1f}%" if raw is not None else None,
+            'source': source
+        }
+        for year, month, value, raw, source in zip(*(c.to_list() for c in columns))
+    ]
+
+
+def _conception_rows(data: pl.DataFrame) -> List[Dict[str, Any]]:
+    """Build conception data cells, rounding and casting with Polars before assembling dicts."""
+    columns = data.select(
+        pl.col('Year').cast(pl.Int64),
+        pl.col('Month').cast(pl.Int64),
+        pl.col('daily_conception_rate').round(2),
+        pl.col('future_births').cast(pl.Int64, strict=False),
+        pl.col('childbearing_population').cast(pl.Int64, strict=False),
+        pl.col('Source'),
+    ).get_columns()
+    return [
+        {
+            'year': year,
+            'month': month,
+            'value': value,
+            'futureBirths': future_births,
+            'population': population,
+            'source': source
+        }
+        for year, month, value, future_births, population, source in zip(*(c.to_list() for c in columns))
+    ]
+
+
+def _complete_years_query(births: pl.LazyFrame) -> pl.LazyFrame:
+    """
+    Lazy query yielding (Country, complete year count) for every Country value with
+    at least one complete year (all 12 months have a valid fertility rate).
+    """
+    return (
+        births
+        .filter(pl.col('daily_fertility_rate').is_not_null())
+        .group_by(['Country', 'Year'])
+        .agg(pl.col('Month').n_unique().alias('month_count'))
+        .filter(pl.col('month_count') == 12)
+        .group_by('Country')
+        .agg(pl.len().alias('complete_years'))
+    )
+
+
+def _categorize_keys(births: pl.DataFrame) -> pl.DataFrame:
+    """
+    Encode the repeated string keys as categoricals once, so grouping, filtering
+    and partitioning by Country compare integer codes rather than strings.
+    """
+    return births.with_columns(pl.col(['Country', 'Source']).cast(pl.Categorical))
+
+
+def _partition_ipc(births: pl.DataFrame, names: List[str]) -> Dict[str, bytes]:
+    """
+    Split births into one Arrow IPC buffer per Country in names.
+
+    Only the exported names and EXPORT_COLUMNS are kept, and the frame is split
+    once, so each worker receives just its own rows as an IPC buffer rather than
+    a pickled frame.
+    """
+    frames = (
+        births.lazy()
+        .filter(pl.col('Country').is_in(names))
+        .select(EXPORT_COLUMNS)
+        .collect()
+        .partition_by('Country', as_dict=True)
+    )
+    return {name: frames[(name,)].write_ipc(None).getvalue() for name in names}
+
+
+def _run_exports(
+    worker: Callable[[tuple], str],
+    export_args: Dict[str, tuple],
+    max_workers: int,
+    label: str,
+    progress_every: int
+) -> None:
+    """
+    Run worker over export_args (name -> worker args) in a process pool.
+
+    Processes rather than threads: building and encoding the payloads is
+    CPU-bound Python work, so threads would serialize on the GIL. A failed
+    export is reported and does not stop the others.
+    """
+    total = len(export_args)
+    print(f"Exporting JSON data for {total} {label} using {max_workers} workers...")
+    completed = 0
+    # Use 'spawn' context since Polars is not fork-safe
+    ctx = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx) as executor:
+        futures = {executor.submit(worker, args): name for name, args in export_args.items()}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                future.result()
+                completed += 1
+                if completed % progress_every == 0:
+                    print(f"  Exported {completed}/{total} {label}...")
+            except Exception as e:
+                print(f"  Error exporting {name}: {e}")
+
+    print(f"\nExported data for {total} {label}")
@@ -3,12 +3,9 @@ JSON exporter for frontend consumption.
 
 Exports processed data to JSON files for the Astro frontend.
 """
-import json
 import os
 from pathlib import Path
-from datetime import datetime
 from typing import List, Dict, Any, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
 import polars as pl
 
 from config import (
@@ -32,6 +29,21 @@ from config import (
     MIN_MONTHLY_BIRTHS,
     ensure_output_dirs,
 )
+from .common import (
+    _generated_at,
+    _encode_json,
+    _write_bytes,
+    _write_mirror,
+    _write_json,
+    _trim_frame,
+    _complete_years_query,
+    _categorize_keys,
+    _partition_ipc,
+    _run_exports,
+    _fertility_rows,
+    _seasonality_rows,
+    _conception_rows,
+)
 
 
 def trim_leading_trailing_nulls(data: List[Dict[str, Any]], value_key: str = 'value') -> List[Dict[str, Any]]:
@@ -75,6 +87,74 @@ def trim_leading_trailing_nulls(data: List[Dict[str, Any]], value_key: str = 'va
     return sorted_data[first_valid:last_valid + 1]
 
 
+# Data source metadata listed in countries.json
+DATA_SOURCES_META = {
+    source: {
+        'name': source,
+        'url': DATA_SOURCE_URLS.get(source)
+    }
+    for source in ['HMD', 'UN', 'JPOP']
+}
+
+def _value_range(data: pl.DataFrame, column: str) -> tuple[Optional[float], Optional[float]]:
+    """Min and max of a column in a single select; (None, None) if it has no non-null values."""
+    return data.select(
+        pl.col(column).min().alias('min'),
+        pl.col(column).max().alias('max'),
+    ).row(0)
+
+
+def _country_stats_query(births: pl.LazyFrame) -> pl.LazyFrame:
+    """
+    Lazy per-country summary used to filter countries, build countries.json and
+    give each export worker its years, sources and color-scale ranges.
+
+    Everything is computed in one plan so the whole export needs a single
+    aggregation pass over births.
+    """
+    has_conception = pl.col('daily_conception_rate').is_not_null()
+    return (
+        births
+        .group_by('Country')
+        .agg(
+            pl.col('Births').min().alias('min_births'),
+            pl.col('Year').min().alias('min_year'),
+            pl.col('Year').max().alias('max_year'),
+            pl.col('Year').unique().sort().alias('years'),
+            pl.col('Source').unique(maintain_order=True).alias('sources'),
+            pl.col('Year').filter(has_conception).min().alias('conception_min_year'),
+            pl.col('Year').filter(has_conception).max().alias('conception_max_year'),
+            pl.col('Year').filter(has_conception).unique().sort().alias('conception_years'),
+            pl.col('daily_fertility_rate').min().alias('fertility_min'),
+            pl.col('daily_fertility_rate').max().alias('fertility_max'),
+            pl.col('seasonality_percentage_normalized').min().alias('seasonality_min'),
+            pl.col('seasonality_percentage_normalized').max().alias('seasonality_max'),
+            pl.col('daily_conception_rate').min().alias('conception_min'),
+            pl.col('daily_conception_rate').max().alias('conception_max'),
+        )
+        .join(_complete_years_query(births), on='Country', how='left')
+        .with_columns(pl.col('complete_years').fill_null(0))
+        # Sort on the string value so categorical Country columns still order alphabetically
+        .sort(pl.col('Country').cast(pl.Utf8))
+    )
+
+
+def compute_complete_years_by_country(births: pl.DataFrame) -> Dict[str, int]:
+    """
+    Count complete years (all 12 months have valid fertility rate data) for every country at once.
+
+    Runs a single group_by over the whole frame instead of filtering it once per country.
+    Countries without any complete year are absent from the result.
+
+    Args:
+        births: DataFrame with all births data
+
+    Returns:
+        Mapping of country name to number of complete years with valid fertility rate data
+    """
+    return dict(_complete_years_query(births.lazy()).collect().iter_rows())
+
+
 def compute_complete_years(births: pl.DataFrame, country_name: str) -> int:
     """
     Count the number of complete years (all 12 months have valid fertility rate data) for a country.
@@ -91,21 +171,7 @@ def compute_complete_years(births: pl.DataFrame, country_name: str) -> int:
         Number of complete years with valid fertility rate data
     """
     country_data = births.filter(pl.col('Country') == country_name)
-
-    # Filter to only rows with valid fertility rate data
-    valid_data = country_data.filter(pl.col('daily_fertility_rate').is_not_null())
-
-    # Group by year and count unique months per year
-    year_month_counts = (
-        valid_data
-        .group_by('Year')
-        .agg(pl.col('Month').n_unique().alias('month_count'))
-    )
-
-    # Count years with exactly 12 months
-    complete_years = year_month_counts.filter(pl.col('month_count') == 12).height
-
-    return complete_years
+    return compute_complete_years_by_country(country_data).get(country_name, 0)
 
 
 def filter_countries_by_min_years(
@@ -124,12 +190,13 @@ def filter_countries_by_min_years(
         - included_countries: List of country names that pass the filter
         - excluded_countries_with_counts: List of (country_name, complete_years) for excluded countries
     """
-    all_countries = sorted(births['Country'].unique().to_list())
+    all_countries = births['Country'].unique().sort().to_list()
+    complete_years_by_country = compute_complete_years_by_country(births)
     included = []
     excluded = []
 
     for country_name in all_countries:
-        complete_years = compute_complete_years(births, country_name)
+        complete_years = complete_years_by_country.get(country_name, 0)
         if complete_years >= min_years:
             included.append(country_name)
         else:
@@ -157,16 +224,17 @@ def filter_countries_by_min_monthly_births(
         - included_countries: List of country names that pass the filter
         - excluded_countries_with_min_births: List of (country_name, min_births) for excluded countries
     """
-    all_countries = sorted(births['Country'].unique().to_list())
+    # Minimum births in any month, for every country in one pass
+    min_births_by_country = (
+        births
+        .group_by('Country')
+        .agg(pl.col('Births').min().alias('min_births'))
+        .sort('Country')
+    )
     included = []
     excluded = []
 
-    for country_name in all_countries:
-        country_data = births.filter(pl.col('Country') == country_name)
-
-        # Find the minimum births in any month for this country
-        min_births_value = country_data['Births'].min()
-
+    for country_name, min_births_value in min_births_by_country.iter_rows():
         if min_births_value is not None and min_births_value >= min_monthly_births:
             included.append(country_name)
         else:
@@ -179,7 +247,9 @@ def export_countries_index(
     births: pl.DataFrame,
     output_dir: Optional[Path] = None,
     min_years: int = MIN_YEARS_DATA,
-    min_monthly_births: int = MIN_MONTHLY_BIRTHS
+    min_monthly_births: int = MIN_MONTHLY_BIRTHS,
+    generated_at: Optional[str] = None,
+    country_stats: Optional[pl.DataFrame] = None
 ) -> List[str]:
     """
     Export countries.json with metadata about available countries.
@@ -194,6 +264,8 @@ def export_countries_index(
         output_dir: Output directory (defaults to JSON_OUTPUT_DIR)
         min_years: Minimum number of complete years required (default: MIN_YEARS_DATA)
         min_monthly_births: Minimum births required in every month (default: MIN_MONTHLY_BIRTHS)
+        generated_at: Timestamp for the generatedAt field (defaults to now)
+        country_stats: Precomputed per-country stats (computed from births if not given)
 
     Returns:
         List of country names that were included (passed all filters)
@@ -201,10 +273,24 @@ def export_countries_index(
     if output_dir is None:
         output_dir = JSON_OUTPUT_DIR
 
+    if generated_at is None:
+        generated_at = _generated_at()
+
     output_dir.mkdir(parents=True, exist_ok=True)
 
+    # Per-country stats for every filter and the index metadata, in a single pass
+    if country_stats is None:
+        country_stats = _country_stats_query(births.lazy()).collect()
+    meta_by_country = {row['Country']: row for row in country_stats.iter_rows(named=True)}
+
     # Filter countries by minimum years
-    included_countries, excluded_by_years = filter_countries_by_min_years(births, min_years)
+    included_countries = []
+    excluded_by_years = []
+    for country_name, meta in meta_by_country.items():
+        if meta['complete_years'] >= min_years:
+            included_countries.append(country_name)
+        else:
+            excluded_by_years.append((country_name, meta['complete_years']))
 
     if excluded_by_years:
         print(f"Excluding {len(excluded_by_years)} countries with fewer than {min_years} complete years:")
@@ -213,10 +299,15 @@ def export_countries_index(
 
     # Filter remaining countries by minimum monthly births
     # Only check countries that passed the min_years filter
-    births_filtered = births.filter(pl.col('Country').is_in(included_countries))
-    included_countries, excluded_by_births = filter_countries_by_min_monthly_births(
-        births_filtered, min_monthly_births
-    )
+    excluded_by_births = []
+    remaining_countries = []
+    for country_name in included_countries:
+        min_births = meta_by_country[country_name]['min_births']
+        if min_births is not None and min_births >= min_monthly_births:
+            remaining_countries.append(country_name)
+        else:
+            excluded_by_births.append((country_name, int(min_births) if min_births is not None else 0))
+    included_countries = remaining_countries
 
     if excluded_by_births:
         print(f"Excluding {len(excluded_by_births)} countries with months below {min_monthly_births} births:")
@@ -244,34 +335,25 @@ def export_countries_index(
 
     countries = []
     for country_name in included_countries:
-        country_data = births.filter(pl.col('Country') == country_name)
-
-        # Get year range
-        min_year = int(country_data['Year'].min())
-        max_year = int(country_data['Year'].max())
-
-        # Get sources used
-        sources = country_data['Source'].unique().to_list()
-
-        # Get complete years count for metadata
-        complete_years = compute_complete_years(births, country_name)
+        meta = meta_by_country[country_name]
+        min_year = int(meta['min_year'])
+        max_year = int(meta['max_year'])
 
         # Get conception year range (may differ due to edge case filtering)
-        conception_data = country_data.filter(pl.col('daily_conception_rate').is_not_null())
-        if len(conception_data) > 0:
-            conception_min_year = int(conception_data['Year'].min())
-            conception_max_year = int(conception_data['Year'].max())
-            has_conception = True
+        if meta['conception_min_year'] is not None:
+            conception_min_year = int(meta['conception_min_year'])
+            conception_max_year = int(meta['conception_max_year'])
+            has_conception_data = True
         else:
             conception_min_year = min_year
             conception_max_year = max_year
-            has_conception = False
+            has_conception_data = False
 
         countries.append({
             'code': get_country_slug(country_name),
             'name': country_name,
-            'sources': sources,
-            'completeYears': complete_years,
+            'sources': meta['sources'],
+            'completeYears': meta['complete_years'],
             'fertility': {
                 'yearRange': [min_year, max_year],
                 'hasData': True
@@ -282,38 +364,32 @@ def export_countries_index(
             },
             'conception': {
                 'yearRange': [conception_min_year, conception_max_year],
-                'hasData': has_conception
+                'hasData': has_conception_data
             }
         })
 
     output = {
         'countries': countries,
-        'dataSources': {
-            source: {
-                'name': source,
-                'url': DATA_SOURCE_URLS.get(source)
-            }
-            for source in ['HMD', 'UN', 'JPOP']
-        },
+        'dataSources': DATA_SOURCES_META,
         'minYearsThreshold': min_years,
-        'generatedAt': datetime.utcnow().isoformat() + 'Z'
+        'generatedAt': generated_at
     }
 
+    # Encode once and write the same bytes to every destination
+    payload = _encode_json(output, indent=True)
+
     output_path = output_dir / 'countries.json'
-    with open(output_path, 'w') as f:
-        json.dump(output, f, indent=2)
+    _write_bytes(output_path, payload)
 
     # Also export to frontend assets for Vite imports
     frontend_assets_path = FRONTEND_ASSETS_DATA_DIR / 'countries.json'
     frontend_assets_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(frontend_assets_path, 'w') as f:
-        json.dump(output, f, indent=2)
+    _write_mirror(output_path, frontend_assets_path, payload)
 
     # Also export to frontend public for client-side fetch (Compare page)
     frontend_public_path = FRONTEND_PUBLIC_DATA_DIR / 'countries.json'
     frontend_public_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(frontend_public_path, 'w') as f:
-        json.dump(output, f, indent=2)
+    _write_mirror(output_path, frontend_public_path, payload)
 
     print(f"Exported {len(included_countries)} countries to {output_path}, {frontend_assets_path}, and {frontend_public_path}")
 
@@ -339,42 +415,31 @@ def export_fertility_data(
     output_dir.mkdir(parents=True, exist_ok=True)
 
     country_data = births.filter(pl.col('Country') == country_name)
+    slug = get_country_slug(country_name)
 
     # Get metadata
-    years = sorted(country_data['Year'].unique().to_list())
+    years = country_data['Year'].unique().sort().to_list()
     sources = country_data['Source'].unique().to_list()
 
     # Compute color scale domain (absolute min/max to match Python heatmap plotting)
     # Apply floor of 1e-6 for log-scale compatibility
-    valid_values = country_data.filter(pl.col('daily_fertility_rate').is_not_null())
-    if len(valid_values) > 0:
-        min_val = max(float(valid_values['daily_fertility_rate'].min()), 1e-6)
-        max_val = float(valid_values['daily_fertility_rate'].max())
+    min_val, max_val = _value_range(country_data, 'daily_fertility_rate')
+    if min_val is not None:
+        min_val = max(float(min_val), 1e-6)
+        max_val = float(max_val)
     else:
         min_val, max_val = 1e-6, 10
 
-    # Build data array
-    data = []
-    for row in country_data.iter_rows(named=True):
-        value = row['daily_fertility_rate']
-        data.append({
-            'year': int(row['Year']),
-            'month': int(row['Month']),
-            'value': round(value, 2) if value is not None else None,
-            'births': int(row['Births']) if row['Births'] is not None else None,
-            'population': int(row['childbearing_population']) if row['childbearing_population'] is not None else None,
-            'source': row['Source']
-        })
-
-    # Trim leading/trailing null values
-    data = trim_leading_trailing_nulls(data, 'value')
+    # Trim leading/trailing null values, then build the data array from what remains
+    trimmed = _trim_frame(country_data, 'daily_fertility_rate')
+    data = _fertility_rows(trimmed)
 
     # Update years list to only include years present in trimmed data
-    trimmed_years = sorted(set(item['year'] for item in data)) if data else years
+    trimmed_years = trimmed['Year'].unique().sort().to_list() if data else years
 
     output = {
         'country': {
-            'code': get_country_slug(country_name),
+            'code': slug,
             'name': country_name
         },
         'metric': 'daily_fertility_rate',
@@ -388,12 +453,11 @@ def export_fertility_data(
         'months': MONTH_NAMES,
         'data': data,
         'sources': sources,
-        'generatedAt': datetime.utcnow().isoformat() + 'Z'
+        'generatedAt': _generated_at()
     }
 
-    output_path = output_dir / f'{get_country_slug(country_name)}.json'
-    with open(output_path, 'w') as f:
-        json.dump(output, f)
+    output_path = output_dir / f'{slug}.json'
+    _write_json(output_path, output)
 
     print(f"Exported fertility data for {country_name} to {output_path}")
 
@@ -417,17 +481,18 @@ def export_seasonality_data(
     output_dir.mkdir(parents=True, exist_ok=True)
 
     country_data = births.filter(pl.col('Country') == country_name)
+    slug = get_country_slug(country_name)
 
     # Get metadata
-    years = sorted(country_data['Year'].unique().to_list())
+    years = country_data['Year'].unique().sort().to_list()
     sources = country_data['Source'].unique().to_list()
 
     # Compute color scale domain from actual non-null values (excluding provisional data)
     # This ensures the color scale matches the actual data range
-    valid_values = country_data.filter(pl.col('seasonality_percentage_normalized').is_not_null())
-    if len(valid_values) > 0:
-        min_val = float(valid_values['seasonality_percentage_normalized'].min())
-        max_val = float(valid_values['seasonality_percentage_normalized'].max())
+    min_val, max_val = _value_range(country_data, 'seasonality_percentage_normalized')
+    if min_val is not None:
+        min_val = float(min_val)
+        max_val = float(max_val)
         center_val = 0.0833  # ~8.33% is expected for equal distribution (1/12)
         # Ensure center is between min and max for proper diverging scale
         if center_val < min_val:
@@ -438,27 +503,16 @@ def export_seasonality_data(
         # Fallback to default values if no valid data
         min_val, center_val, max_val = 0.065, 0.0833, 0.10
 
-    # Build data array
-    data = []
-    for row in country_data.iter_rows(named=True):
-        value = row['seasonality_percentage_normalized']
-        data.append({
-            'year': int(row['Year']),
-            'month': int(row['Month']),
-            'value': round(value, 4) if value is not None else None,
-            'formattedValue': f"{value * 100:.1f}%" if value is not None else None,
-            'source': row['Source']
-        })
-
-    # Trim leading/trailing null values
-    data = trim_leading_trailing_nulls(data, 'value')
+    # Trim leading/trailing null values, then build the data array from what remains
+    trimmed = _trim_frame(country_data, 'seasonality_percentage_normalized')
+    data = _seasonality_rows(trimmed)
 
     # Update years list to only include years present in trimmed data
-    trimmed_years = sorted(set(item['year'] for item in data)) if data else years
+    trimmed_years = trimmed['Year'].unique().sort().to_list() if data else years
 
     output = {
         'country': {
-            'code': get_country_slug(country_name),
+            'code': slug,
             'name': country_name
         },
         'metric': 'seasonality_percentage_normalized',
@@ -473,12 +527,11 @@ def export_seasonality_data(
         'months': MONTH_NAMES,
         'data': data,
         'sources': sources,
-        'generatedAt': datetime.utcnow().isoformat() + 'Z'
+        'generatedAt': _generated_at()
     }
 
-    output_path = output_dir / f'{get_country_slug(country_name)}.json'
-    with open(output_path, 'w') as f:
-        json.dump(output, f)
+    output_path = output_dir / f'{slug}.json'
+    _write_json(output_path, output)
 
     print(f"Exported seasonality data for {country_name} to {output_path}")
 
@@ -504,6 +557,7 @@ def export_conception_data(
     output_dir.mkdir(parents=True, exist_ok=True)
 
     country_data = births.filter(pl.col('Country') == country_name)
+    slug = get_country_slug(country_name)
 
     # Filter to only rows with valid conception rate (has future births data)
     valid_data = country_data.filter(pl.col('daily_conception_rate').is_not_null())
@@ -513,30 +567,21 @@ def export_conception_data(
         return
 
     # Get metadata from valid data only
-    years = sorted(valid_data['Year'].unique().to_list())
+    years = valid_data['Year'].unique().sort().to_list()
     sources = valid_data['Source'].unique().to_list()
 
     # Compute color scale domain (absolute min/max)
     # Apply floor of 1e-6 for log-scale compatibility
-    min_val = max(float(valid_data['daily_conception_rate'].min()), 1e-6)
-    max_val = float(valid_data['daily_conception_rate'].max())
+    min_val, max_val = _value_range(valid_data, 'daily_conception_rate')
+    min_val = max(float(min_val), 1e-6)
+    max_val = float(max_val)
 
     # Build data array (only valid rows)
-    data = []
-    for row in valid_data.iter_rows(named=True):
-        value = row['daily_conception_rate']
-        data.append({
-            'year': int(row['Year']),
-            'month': int(row['Month']),
-            'value': round(value, 2) if value is not None else None,
-            'futureBirths': int(row['future_births']) if row['future_births'] is not None else None,
-            'population': int(row['childbearing_population']) if row['childbearing_population'] is not None else None,
-            'source': row['Source']
-        })
+    data = _conception_rows(valid_data)
 
     output = {
         'country': {
-            'code': get_country_slug(country_name),
+            'code': slug,
             'name': country_name
         },
         'metric': 'daily_conception_rate',
@@ -551,60 +596,50 @@ def export_conception_data(
         'months': MONTH_NAMES,
         'data': data,
         'sources': sources,
-        'generatedAt': datetime.utcnow().isoformat() + 'Z'
+        'generatedAt': _generated_at()
     }
 
-    output_path = output_dir / f'{get_country_slug(country_name)}.json'
-    with open(output_path, 'w') as f:
-        json.dump(output, f)
+    output_path = output_dir / f'{slug}.json'
+    _write_json(output_path, output)
 
     print(f"Exported conception data for {country_name} to {output_path}")
 
 
 def _export_country_json(args: tuple) -> str:
     """Helper function to export JSON data for a single country (for parallel execution)."""
-    (births_dict, country_name, fertility_dir, seasonality_dir, conception_dir,
+    (country_ipc, meta, country_name, fertility_dir, seasonality_dir, conception_dir,
      frontend_fertility_dir, frontend_seasonality_dir, frontend_conception_dir,
-     public_fertility_dir, public_seasonality_dir, public_conception_dir) = args
+     public_fertility_dir, public_seasonality_dir, public_conception_dir, generated_at) = args
 
-    # Reconstruct DataFrame from dict for this country
-    births = pl.DataFrame(births_dict)
-    country_data = births.filter(pl.col('Country') == country_name)
+    # Rebuild this country's rows from the Arrow IPC buffer sent by the parent
+    country_data = pl.read_ipc(country_ipc)
+
+    slug = get_country_slug(country_name)
+    filename = f'{slug}.json'
 
     # Export fertility data inline (avoid function call overhead)
-    fertility_dir.mkdir(parents=True, exist_ok=True)
-    years = sorted(country_data['Year'].unique().to_list())
-    sources = country_data['Source'].unique().to_list()
+    # Years, sources and value ranges come precomputed from the country stats pass
+    years = meta['years']
+    sources = meta['sources']
 
     # Compute color scale domain (absolute min/max to match Python heatmap plotting)
     # Apply floor of 1e-6 for log-scale compatibility
-    valid_values = country_data.filter(pl.col('daily_fertility_rate').is_not_null())
-    if len(valid_values) > 0:
-        min_val = max(float(valid_values['daily_fertility_rate'].min()), 1e-6)
-        max_val = float(valid_values['daily_fertility_rate'].max())
+    min_val, max_val = meta['fertility_min'], meta['fertility_max']
+    if min_val is not None:
+        min_val = max(float(min_val), 1e-6)
+        max_val = float(max_val)
     else:
         min_val, max_val = 1e-6, 10
 
-    fertility_data = []
-    for row in country_data.iter_rows(named=True):
-        value = row['daily_fertility_rate']
-        fertility_data.append({
-            'year': int(row['Year']),
-            'month': int(row['Month']),
-            'value': round(value, 2) if value is not None else None,
-            'births': int(row['Births']) if row['Births'] is not None else None,
-            'population': int(row['childbearing_population']) if row['childbearing_population'] is not None else None,
-            'source': row['Source']
-        })
-
-    # Trim leading/trailing null values
-    fertility_data = trim_leading_trailing_nulls(fertility_data, 'value')
+    # Trim leading/trailing null values, then build the data array from what remains
+    fertility_frame = _trim_frame(country_data, 'daily_fertility_rate')
+    fertility_data = _fertility_rows(fertility_frame)
 
     # Update years list to only include years present in trimmed data
-    fertility_years = sorted(set(item['year'] for item in fertility_data)) if fertility_data else years
+    fertility_years = fertility_frame['Year'].unique().sort().to_list() if fertility_data else years
 
     fertility_output = {
-        'country': {'code': get_country_slug(country_name), 'name': country_name},
+        'country': {'code': slug, 'name': country_name},
         'metric': 'daily_fertility_rate',
         'title': 'Daily Births Per 100k Women (Age 15-44)',
         'colorScale': {'type': 'sequential', 'domain': [round(min_val, 1), round(max_val, 1)], 'scheme': 'turbo'},
@@ -612,31 +647,25 @@ def _export_country_json(args: tuple) -> str:
         'months': MONTH_NAMES,
         'data': fertility_data,
         'sources': sources,
-        'generatedAt': datetime.utcnow().isoformat() + 'Z'
+        'generatedAt': generated_at
     }
 
-    fertility_filename = f'{get_country_slug(country_name)}.json'
-    with open(fertility_dir / fertility_filename, 'w') as f:
-        json.dump(fertility_output, f)
+    # Encode once and write the same bytes to every destination
+    fertility_payload = _encode_json(fertility_output)
+    _write_bytes(fertility_dir / filename, fertility_payload)
 
     # Also export to frontend assets
-    frontend_fertility_dir.mkdir(parents=True, exist_ok=True)
-    with open(frontend_fertility_dir / fertility_filename, 'w') as f:
-        json.dump(fertility_output, f)
+    _write_mirror(fertility_dir / filename, frontend_fertility_dir / filename, fertility_payload)
 
     # Also export to frontend public for client-side fetch
-    public_fertility_dir.mkdir(parents=True, exist_ok=True)
-    with open(public_fertility_dir / fertility_filename, 'w') as f:
-        json.dump(fertility_output, f)
+    _write_mirror(fertility_dir / filename, public_fertility_dir / filename, fertility_payload)
 
     # Export seasonality data inline
-    seasonality_dir.mkdir(parents=True, exist_ok=True)
-    
     # Compute color scale domain from actual non-null values (excluding provisional data)
-    valid_seasonality_values = country_data.filter(pl.col('seasonality_percentage_normalized').is_not_null())
-    if len(valid_seasonality_values) > 0:
-        seasonality_min_val = float(valid_seasonality_values['seasonality_percentage_normalized'].min())
-        seasonality_max_val = float(valid_seasonality_values['seasonality_percentage_normalized'].max())
+    seasonality_min_val, seasonality_max_val = meta['seasonality_min'], meta['seasonality_max']
+    if seasonality_min_val is not None:
+        seasonality_min_val = float(seasonality_min_val)
+        seasonality_max_val = float(seasonality_max_val)
         seasonality_center_val = 0.0833  # ~8.33% is expected for equal distribution (1/12)
         # Ensure center is between min and max for proper diverging scale
         if seasonality_center_val < seasonality_min_val:
@@ -647,25 +676,15 @@ def _export_country_json(args: tuple) -> str:
         # Fallback to default values if no valid data
         seasonality_min_val, seasonality_center_val, seasonality_max_val = 0.065, 0.0833, 0.10
     
-    seasonality_data = []
-    for row in country_data.iter_rows(named=True):
-        value = row['seasonality_percentage_normalized']
-        seasonality_data.append({
-            'year': int(row['Year']),
-            'month': int(row['Month']),
-            'value': round(value, 4) if value is not None else None,
-            'formattedValue': f"{value * 100:.1f}%" if value is not None else None,
-            'source': row['Source']
-        })
-
-    # Trim leading/trailing null values
-    seasonality_data = trim_leading_trailing_nulls(seasonality_data, 'value')
+    # Trim leading/trailing null values, then build the data array from what remains
+    seasonality_frame = _trim_frame(country_data, 'seasonality_percentage_normalized')
+    seasonality_data = _seasonality_rows(seasonality_frame)
 
     # Update years list to only include years present in trimmed data
-    seasonality_years = sorted(set(item['year'] for item in seasonality_data)) if seasonality_data else years
+    seasonality_years = seasonality_frame['Year'].unique().sort().to_list() if seasonality_data else years
 
     seasonality_output = {
-        'country': {'code': get_country_slug(country_name), 'name': country_name},
+        'country': {'code': slug, 'name': country_name},
         'metric': 'seasonality_percentage_normalized',
         'title': 'Percentage of Annual Live Births',
         'subtitle': 'Normalized to 30-day months and 360-day years',
@@ -682,48 +701,32 @@ def _export_country_json(args: tuple) -> str:
         'months': MONTH_NAMES,
         'data': seasonality_data,
         'sources': sources,
-        'generatedAt': datetime.utcnow().isoformat() + 'Z'
+        'generatedAt': generated_at
     }
 
-    seasonality_filename = f'{get_country_slug(country_name)}.json'
-    with open(seasonality_dir / seasonality_filename, 'w') as f:
-        json.dump(seasonality_output, f)
+    seasonality_payload = _encode_json(seasonality_output)
+    _write_bytes(seasonality_dir / filename, seasonality_payload)
 
     # Also export to frontend assets
-    frontend_seasonality_dir.mkdir(parents=True, exist_ok=True)
-    with open(frontend_seasonality_dir / seasonality_filename, 'w') as f:
-        json.dump(seasonality_output, f)
+    _write_mirror(seasonality_dir / filename, frontend_seasonality_dir / filename, seasonality_payload)
 
     # Also export to frontend public for client-side fetch
-    public_seasonality_dir.mkdir(parents=True, exist_ok=True)
-    with open(public_seasonality_dir / seasonality_filename, 'w') as f:
-        json.dump(seasonality_output, f)
+    _write_mirror(seasonality_dir / filename, public_seasonality_dir / filename, seasonality_payload)
 
     # Export conception data inline (only for rows with valid conception rate)
-    valid_conception_data = country_data.filter(pl.col('daily_conception_rate').is_not_null())
-
-    if len(valid_conception_data) > 0:
-        conception_dir.mkdir(parents=True, exist_ok=True)
-        conception_years = sorted(valid_conception_data['Year'].unique().to_list())
+    if meta['conception_years']:
+        valid_conception_data = country_data.filter(pl.col('daily_conception_rate').is_not_null())
+        conception_years = meta['conception_years']
 
         # Compute color scale domain
-        conception_min_val = max(float(valid_conception_data['daily_conception_rate'].min()), 1e-6)
-        conception_max_val = float(valid_conception_data['daily_conception_rate'].max())
-
-        conception_data = []
-        for row in valid_conception_data.iter_rows(named=True):
-            value = row['daily_conception_rate']
-            conception_data.append({
-                'year': int(row['Year']),
-                'month': int(row['Month']),
-                'value': round(value, 2) if value is not None else None,
-                'futureBirths': int(row['future_births']) if row['future_births'] is not None else None,
-                'population': int(row['childbearing_population']) if row['childbearing_population'] is not None else None,
-                'source': row['Source']
-            })
+        conception_min_val, conception_max_val = meta['conception_min'], meta['conception_max']
+        conception_min_val = max(float(conception_min_val), 1e-6)
+        conception_max_val = float(conception_max_val)
+
+        conception_data = _conception_rows(valid_conception_data)
 
         conception_output = {
-            'country': {'code': get_country_slug(country_name), 'name': country_name},
+            'country': {'code': slug, 'name': country_name},
             'metric': 'daily_conception_rate',
             'title': 'Daily Conceptions Per 100k Women (Age 15-44)',
             'subtitle': 'Based on births 10 months later',
@@ -736,22 +739,17 @@ def _export_country_json(args: tuple) -> str:
             'months': MONTH_NAMES,
             'data': conception_data,
             'sources': sources,
-            'generatedAt': datetime.utcnow().isoformat() + 'Z'
+            'generatedAt': generated_at
         }
 
-        conception_filename = f'{get_country_slug(country_name)}.json'
-        with open(conception_dir / conception_filename, 'w') as f:
-            json.dump(conception_output, f)
+        conception_payload = _encode_json(conception_output)
+        _write_bytes(conception_dir / filename, conception_payload)
 
         # Also export to frontend assets
-        frontend_conception_dir.mkdir(parents=True, exist_ok=True)
-        with open(frontend_conception_dir / conception_filename, 'w') as f:
-            json.dump(conception_output, f)
+        _write_mirror(conception_dir / filename, frontend_conception_dir / filename, conception_payload)
 
         # Also export to frontend public for client-side fetch
-        public_conception_dir.mkdir(parents=True, exist_ok=True)
-        with open(public_conception_dir / conception_filename, 'w') as f:
-            json.dump(conception_output, f)
+        _write_mirror(conception_dir / filename, public_conception_dir / filename, conception_payload)
 
     return country_name
 
@@ -785,40 +783,48 @@ def export_all_countries(
     # Ensure output directories exist
     ensure_output_dirs()
 
+    births = _categorize_keys(births)
+
+    # Stamp every file from this run with the same timestamp
+    generated_at = _generated_at()
+
+    # Per-country stats shared by the index export and the per-country workers
+    country_stats = _country_stats_query(births.lazy()).collect()
+    meta_by_country = {row['Country']: row for row in country_stats.iter_rows(named=True)}
+
     # Export countries index and get filtered country list
-    countries = export_countries_index(births, output_dir, min_years, min_monthly_births)
+    countries = export_countries_index(
+        births, output_dir, min_years, min_monthly_births, generated_at, country_stats
+    )
 
     # Prepare for parallel export (only for filtered countries)
     fertility_dir = output_dir / 'fertility'
     seasonality_dir = output_dir / 'seasonality'
     conception_dir = output_dir / 'conception'
 
-    # Convert DataFrame to dict for pickling (needed for multiprocessing)
-    births_dict = births.to_dict()
+    # Create every destination once up front rather than in each worker
+    for directory in (
+        fertility_dir, seasonality_dir, conception_dir,
+        FRONTEND_ASSETS_FERTILITY_DIR, FRONTEND_ASSETS_SEASONALITY_DIR, FRONTEND_ASSETS_CONCEPTION_DIR,
+        FRONTEND_PUBLIC_FERTILITY_DIR, FRONTEND_PUBLIC_SEASONALITY_DIR, FRONTEND_PUBLIC_CONCEPTION_DIR,
+    ):
+        directory.mkdir(parents=True, exist_ok=True)
+
+    # Each worker only receives its own country's rows, as an Arrow IPC buffer
+    country_ipc = _partition_ipc(births, countries)
 
     # Create args for each country (including frontend assets and public directories)
-    export_args = [
-        (births_dict, country_name, fertility_dir, seasonality_dir, conception_dir,
-         FRONTEND_ASSETS_FERTILITY_DIR, FRONTEND_ASSETS_SEASONALITY_DIR, FRONTEND_ASSETS_CONCEPTION_DIR,
-         FRONTEND_PUBLIC_FERTILITY_DIR, FRONTEND_PUBLIC_SEASONALITY_DIR, FRONTEND_PUBLIC_CONCEPTION_DIR)
+    export_args = {
+        country_name: (
+            country_ipc[country_name], meta_by_country[country_name], country_name,
+            fertility_dir, seasonality_dir, conception_dir,
+            FRONTEND_ASSETS_FERTILITY_DIR, FRONTEND_ASSETS_SEASONALITY_DIR, FRONTEND_ASSETS_CONCEPTION_DIR,
+            FRONTEND_PUBLIC_FERTILITY_DIR, FRONTEND_PUBLIC_SEASONALITY_DIR, FRONTEND_PUBLIC_CONCEPTION_DIR,
+            generated_at
+        )
         for country_name in countries
-    ]
-
-    # Export in parallel using threads (I/O bound)
-    print(f"Exporting JSON data for {len(countries)} countries using {max_workers} workers...")
-    completed = 0
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {executor.submit(_export_country_json, args): args[1] for args in export_args}
-        for future in as_completed(futures):
-            country_name = futures[future]
-            try:
-                future.result()
-                completed += 1
-                if completed % 20 == 0:
-                    print(f"  Exported {completed}/{len(countries)} countries...")
-            except Exception as e:
-                print(f"  Error exporting {country_name}: {e}")
-
-    print(f"\nExported data for {len(countries)} countries")
+    }
+
+    _run_exports(_export_country_json, export_args, max_workers, 'countries', progress_every=20)
 
     return countries
@@ -5,12 +5,9 @@ Exports processed US state-level data to JSON files for the Astro frontend.
 Maintains separate structure from country data (states.json vs countries.json).
 Output directories are nested under /states/ subdirectories.
 """
-import json
 import os
 from pathlib import Path
-from datetime import datetime
-from typing import List, Dict, Any, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Optional
 import polars as pl
 
 from config import (
@@ -33,6 +30,20 @@ from config import (
     MIN_MONTHLY_BIRTHS,
     ensure_output_dirs,
 )
+from .common import (
+    _encode_json,
+    _write_bytes,
+    _write_mirror,
+    _trim_frame,
+    _complete_years_query,
+    _categorize_keys,
+    _partition_ipc,
+    _generated_at,
+    _run_exports,
+    _fertility_rows,
+    _seasonality_rows,
+    _conception_rows,
+)
 
 
 def get_state_slug(state_name: str) -> str:
@@ -45,98 +56,81 @@ def get_state_slug(state_name: str) -> str:
     return get_country_slug(state_name)
 
 
-def trim_leading_trailing_nulls(data: List[Dict[str, Any]], value_key: str = 'value') -> List[Dict[str, Any]]:
-    """
-    Remove leading and trailing entries with null values from data array.
-
-    Like stripping whitespace from a string - null values in the middle are preserved,
-    but null values at the beginning or end are removed.
+def _state_stats_query(births: pl.LazyFrame, metadata: bool = True) -> pl.LazyFrame:
     """
-    if not data:
-        return data
-
-    sorted_data = sorted(data, key=lambda x: (x['year'], x['month']))
-
-    first_valid = None
-    for i, item in enumerate(sorted_data):
-        if item.get(value_key) is not None:
-            first_valid = i
-            break
-
-    if first_valid is None:
-        return []
-
-    last_valid = None
-    for i in range(len(sorted_data) - 1, -1, -1):
-        if sorted_data[i].get(value_key) is not None:
-            last_valid = i
-            break
-
-    return sorted_data[first_valid:last_valid + 1]
+    Lazy per-state summary used to filter states and build states.json.
 
-
-def compute_complete_years(births: pl.DataFrame, state_name: str) -> int:
-    """
-    Count the number of complete years (all 12 months have valid fertility rate data) for a state.
+    The filter inputs and every index field come out of one plan, so the index
+    needs a single aggregation pass over births. With metadata=False only the
+    filter inputs (min_births, complete_years) are computed.
     """
-    state_data = births.filter(pl.col('Country') == state_name)
-    valid_data = state_data.filter(pl.col('daily_fertility_rate').is_not_null())
-
-    year_month_counts = (
-        valid_data
-        .group_by('Year')
-        .agg(pl.col('Month').n_unique().alias('month_count'))
+    aggregations = [pl.col('Births').min().alias('min_births')]
+    if metadata:
+        has_conception = pl.col('daily_conception_rate').is_not_null()
+        aggregations += [
+            pl.col('Year').min().alias('min_year'),
+            pl.col('Year').max().alias('max_year'),
+            pl.col('Source').unique(maintain_order=True).alias('sources'),
+            pl.col('Year').filter(has_conception).min().alias('conception_min_year'),
+            pl.col('Year').filter(has_conception).max().alias('conception_max_year'),
+        ]
+    return (
+        births
+        .group_by('Country')
+        .agg(aggregations)
+        .join(_complete_years_query(births), on='Country', how='left')
+        .with_columns(pl.col('complete_years').fill_null(0))
+        # Sort on the string value so categorical Country columns still order alphabetically
+        .sort(pl.col('Country').cast(pl.Utf8))
     )
 
-    complete_years = year_month_counts.filter(pl.col('month_count') == 12).height
-    return complete_years
-
 
-def filter_states_by_min_years(
+def filter_states(
     births: pl.DataFrame,
-    min_years: int = MIN_YEARS_DATA
-) -> tuple[List[str], List[tuple[str, int]]]:
-    """Filter states based on minimum years of complete data."""
-    all_states = sorted(births['Country'].unique().to_list())
-    included = []
-    excluded = []
+    min_years: int = MIN_YEARS_DATA,
+    min_monthly_births: int = MIN_MONTHLY_BIRTHS,
+    state_stats: Optional[pl.DataFrame] = None
+) -> tuple[List[str], List[tuple[str, int]], List[tuple[str, int]]]:
+    """
+    Apply the minimum-years and minimum-monthly-births filters in one pass.
 
-    for state_name in all_states:
-        complete_years = compute_complete_years(births, state_name)
-        if complete_years >= min_years:
-            included.append(state_name)
-        else:
-            excluded.append((state_name, complete_years))
+    The births filter only considers states that passed the years filter.
 
-    return included, excluded
+    Args:
+        births: DataFrame with state data (Country column contains state names)
+        min_years: Minimum number of complete years required
+        min_monthly_births: Minimum births required in every month
+        state_stats: Precomputed per-state stats (computed from births if not given)
 
+    Returns:
+        Tuple of (included states, (state, complete years) excluded by years,
+        (state, minimum monthly births) excluded by births)
+    """
+    if state_stats is None:
+        state_stats = _state_stats_query(births.lazy(), metadata=False).collect()
 
-def filter_states_by_min_monthly_births(
-    births: pl.DataFrame,
-    min_monthly_births: int = MIN_MONTHLY_BIRTHS
-) -> tuple[List[str], List[tuple[str, int]]]:
-    """Filter states based on minimum monthly births."""
-    all_states = sorted(births['Country'].unique().to_list())
     included = []
-    excluded = []
-
-    for state_name in all_states:
-        state_data = births.filter(pl.col('Country') == state_name)
-        min_births_value = state_data['Births'].min()
-
-        if min_births_value is not None and min_births_value >= min_monthly_births:
-            included.append(state_name)
+    excluded_by_years = []
+    excluded_by_births = []
+    for state_name, min_births, complete_years in state_stats.select(
+        'Country', 'min_births', 'complete_years'
+    ).iter_rows():
+        if complete_years < min_years:
+            excluded_by_years.append((state_name, complete_years))
+        elif min_births is None or min_births < min_monthly_births:
+            excluded_by_births.append((state_name, int(min_births) if min_births is not None else 0))
         else:
-            excluded.append((state_name, int(min_births_value) if min_births_value is not None else 0))
+            included.append(state_name)
 
-    return included, excluded
+    return included, excluded_by_years, excluded_by_births
 
 
 def export_states_index(
     births: pl.DataFrame,
     output_dir: Optional[Path] = None,
     min_years: int = MIN_YEARS_DATA,
-    min_monthly_births: int = MIN_MONTHLY_BIRTHS
+    min_monthly_births: int = MIN_MONTHLY_BIRTHS,
+    generated_at: Optional[str] = None
 ) -> List[str]:
     """
     Export states.json with metadata about available US states.
@@ -148,6 +142,7 @@ def export_states_index(
         output_dir: Output directory (defaults to JSON_OUTPUT_DIR)
         min_years: Minimum number of complete years required
         min_monthly_births: Minimum births required in every month
+        generated_at: Timestamp for the generatedAt field (defaults to now)
 
     Returns:
         List of state names that were included (passed all filters)
@@ -155,22 +150,28 @@ def export_states_index(
     if output_dir is None:
         output_dir = JSON_OUTPUT_DIR
 
+    if generated_at is None:
+        generated_at = _generated_at()
+
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Filter states by minimum years
-    included_states, excluded_by_years = filter_states_by_min_years(births, min_years)
+    output_path = output_dir / 'states.json'
+    frontend_assets_path = FRONTEND_ASSETS_DATA_DIR / 'states.json'
+    frontend_public_path = FRONTEND_PUBLIC_DATA_DIR / 'states.json'
+
+    # Per-state stats for both filters and the index entries, in a single pass
+    state_stats = _state_stats_query(births.lazy()).collect()
+    meta_by_state = {row['Country']: row for row in state_stats.iter_rows(named=True)}
+
+    included_states, excluded_by_years, excluded_by_births = filter_states(
+        births, min_years, min_monthly_births, state_stats
+    )
 
     if excluded_by_years:
         print(f"Excluding {len(excluded_by_years)} states with fewer than {min_years} complete years:")
         for state_name, years in excluded_by_years:
             print(f"  - {state_name}: {years} complete years")
 
-    # Filter remaining states by minimum monthly births
-    births_filtered = births.filter(pl.col('Country').is_in(included_states))
-    included_states, excluded_by_births = filter_states_by_min_monthly_births(
-        births_filtered, min_monthly_births
-    )
-
     if excluded_by_births:
         print(f"Excluding {len(excluded_by_births)} states with months below {min_monthly_births} births:")
         for state_name, min_births in excluded_by_births:
@@ -178,34 +179,24 @@ def export_states_index(
 
     states = []
     for state_name in included_states:
-        state_data = births.filter(pl.col('Country') == state_name)
-
-        # Get year range
-        min_year = int(state_data['Year'].min())
-        max_year = int(state_data['Year'].max())
-
-        # Get sources used
-        sources = state_data['Source'].unique().to_list()
-
-        # Get complete years count
-        complete_years = compute_complete_years(births, state_name)
-
-        # Get conception year range (may differ due to edge case filtering)
-        conception_data = state_data.filter(pl.col('daily_conception_rate').is_not_null())
-        if len(conception_data) > 0:
-            conception_min_year = int(conception_data['Year'].min())
-            conception_max_year = int(conception_data['Year'].max())
-            has_conception = True
+        meta = meta_by_state[state_name]
+        min_year = meta['min_year']
+        max_year = meta['max_year']
+
+        # Conception year range may differ due to edge case filtering
+        has_conception = meta['conception_min_year'] is not None
+        if has_conception:
+            conception_min_year = meta['conception_min_year']
+            conception_max_year = meta['conception_max_year']
         else:
             conception_min_year = min_year
             conception_max_year = max_year
-            has_conception = False
 
         states.append({
             'code': get_state_slug(state_name),
             'name': state_name,
-            'sources': sources,
-            'completeYears': complete_years,
+            'sources': meta['sources'],
+            'completeYears': meta['complete_years'],
             'fertility': {
                 'yearRange': [min_year, max_year],
                 'hasData': True
@@ -230,25 +221,20 @@ def export_states_index(
             for source in ['CDC', 'Historical', 'Census', 'NHGIS']
         },
         'minYearsThreshold': min_years,
-        'generatedAt': datetime.utcnow().isoformat() + 'Z'
+        'generatedAt': generated_at
     }
 
     # Write to output directory
-    output_path = output_dir / 'states.json'
-    with open(output_path, 'w') as f:
-        json.dump(output, f, indent=2)
+    payload = _encode_json(output, indent=True)
+    _write_bytes(output_path, payload)
 
     # Write to frontend assets
-    frontend_assets_path = FRONTEND_ASSETS_DATA_DIR / 'states.json'
     frontend_assets_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(frontend_assets_path, 'w') as f:
-        json.dump(output, f, indent=2)
+    _write_mirror(output_path, frontend_assets_path, payload)
 
     # Write to frontend public
-    frontend_public_path = FRONTEND_PUBLIC_DATA_DIR / 'states.json'
     frontend_public_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(frontend_public_path, 'w') as f:
-        json.dump(output, f, indent=2)
+    _write_mirror(output_path, frontend_public_path, payload)
 
     print(f"Exported {len(included_states)} states to {output_path}, {frontend_assets_path}, and {frontend_public_path}")
 
@@ -257,43 +243,37 @@ def export_states_index(
 
 def _export_state_json(args: tuple) -> str:
     """Helper function to export JSON data for a single state (for parallel execution)."""
-    (births_dict, state_name, fertility_dir, seasonality_dir, conception_dir,
+    (state_ipc, state_name, fertility_dir, seasonality_dir, conception_dir,
      frontend_fertility_dir, frontend_seasonality_dir, frontend_conception_dir,
-     public_fertility_dir, public_seasonality_dir, public_conception_dir) = args
-
-    # Reconstruct DataFrame from dict for this state
-    births = pl.DataFrame(births_dict)
-    state_data = births.filter(pl.col('Country') == state_name)
-
-    # Get metadata
-    years = sorted(state_data['Year'].unique().to_list())
-    sources = state_data['Source'].unique().to_list()
+     public_fertility_dir, public_seasonality_dir, public_conception_dir, generated_at) = args
+
+    # Rebuild this state's rows from the Arrow IPC buffer sent by the parent
+    state_data = pl.read_ipc(state_ipc)
+
+    # Metadata and value ranges for every metric in a single pass (min/max skip nulls)
+    stats = state_data.select(
+        pl.col('Year').unique().sort().implode().alias('years'),
+        pl.col('Source').unique(maintain_order=True).implode().alias('sources'),
+        pl.col('daily_fertility_rate').min().alias('fertility_min'),
+        pl.col('daily_fertility_rate').max().alias('fertility_max'),
+        pl.col('seasonality_percentage_normalized').min().alias('seasonality_min'),
+        pl.col('seasonality_percentage_normalized').max().alias('seasonality_max'),
+        pl.col('daily_conception_rate').min().alias('conception_min'),
+        pl.col('daily_conception_rate').max().alias('conception_max'),
+    ).row(0, named=True)
+    years = stats['years']
+    sources = stats['sources']
     state_slug = get_state_slug(state_name)
 
     # --- Export fertility data ---
-    fertility_dir.mkdir(parents=True, exist_ok=True)
-
-    valid_fertility = state_data.filter(pl.col('daily_fertility_rate').is_not_null())
-    if len(valid_fertility) > 0:
-        min_val = max(float(valid_fertility['daily_fertility_rate'].min()), 1e-6)
-        max_val = float(valid_fertility['daily_fertility_rate'].max())
+    if stats['fertility_min'] is not None:
+        min_val = max(float(stats['fertility_min']), 1e-6)
+        max_val = float(stats['fertility_max'])
     else:
         min_val, max_val = 1e-6, 10
 
-    fertility_data = []
-    for row in state_data.iter_rows(named=True):
-        value = row['daily_fertility_rate']
-        fertility_data.append({
-            'year': int(row['Year']),
-            'month': int(row['Month']),
-            'value': round(value, 2) if value is not None else None,
-            'births': int(row['Births']) if row['Births'] is not None else None,
-            'population': int(row['childbearing_population']) if row['childbearing_population'] is not None else None,
-            'source': row['Source']
-        })
-
-    fertility_data = trim_leading_trailing_nulls(fertility_data, 'value')
-    fertility_years = sorted(set(item['year'] for item in fertility_data)) if fertility_data else years
+    fertility_frame = _trim_frame(state_data, 'daily_fertility_rate')
+    fertility_years = fertility_frame['Year'].unique().sort().to_list() if fertility_frame.height else years
 
     fertility_output = {
         'state': {'code': state_slug, 'name': state_name},
@@ -302,30 +282,22 @@ def _export_state_json(args: tuple) -> str:
         'colorScale': {'type': 'sequential', 'domain': [round(min_val, 1), round(max_val, 1)], 'scheme': 'turbo'},
         'years': [int(y) for y in fertility_years],
         'months': MONTH_NAMES,
-        'data': fertility_data,
+        'data': _fertility_rows(fertility_frame),
         'sources': sources,
-        'generatedAt': datetime.utcnow().isoformat() + 'Z'
+        'generatedAt': generated_at
     }
 
     fertility_filename = f'{state_slug}.json'
-    with open(fertility_dir / fertility_filename, 'w') as f:
-        json.dump(fertility_output, f)
+    fertility_payload = _encode_json(fertility_output)
+    _write_bytes(fertility_dir / fertility_filename, fertility_payload)
 
-    frontend_fertility_dir.mkdir(parents=True, exist_ok=True)
-    with open(frontend_fertility_dir / fertility_filename, 'w') as f:
-        json.dump(fertility_output, f)
-
-    public_fertility_dir.mkdir(parents=True, exist_ok=True)
-    with open(public_fertility_dir / fertility_filename, 'w') as f:
-        json.dump(fertility_output, f)
+    _write_mirror(fertility_dir / fertility_filename, frontend_fertility_dir / fertility_filename, fertility_payload)
+    _write_mirror(fertility_dir / fertility_filename, public_fertility_dir / fertility_filename, fertility_payload)
 
     # --- Export seasonality data ---
-    seasonality_dir.mkdir(parents=True, exist_ok=True)
-
-    valid_seasonality = state_data.filter(pl.col('seasonality_percentage_normalized').is_not_null())
-    if len(valid_seasonality) > 0:
-        seasonality_min_val = float(valid_seasonality['seasonality_percentage_normalized'].min())
-        seasonality_max_val = float(valid_seasonality['seasonality_percentage_normalized'].max())
+    if stats['seasonality_min'] is not None:
+        seasonality_min_val = float(stats['seasonality_min'])
+        seasonality_max_val = float(stats['seasonality_max'])
         seasonality_center_val = 0.0833
         if seasonality_center_val < seasonality_min_val:
             seasonality_center_val = seasonality_min_val
@@ -334,19 +306,8 @@ def _export_state_json(args: tuple) -> str:
     else:
         seasonality_min_val, seasonality_center_val, seasonality_max_val = 0.065, 0.0833, 0.10
 
-    seasonality_data = []
-    for row in state_data.iter_rows(named=True):
-        value = row['seasonality_percentage_normalized']
-        seasonality_data.append({
-            'year': int(row['Year']),
-            'month': int(row['Month']),
-            'value': round(value, 4) if value is not None else None,
-            'formattedValue': f"{value * 100:.1f}%" if value is not None else None,
-            'source': row['Source']
-        })
-
-    seasonality_data = trim_leading_trailing_nulls(seasonality_data, 'value')
-    seasonality_years = sorted(set(item['year'] for item in seasonality_data)) if seasonality_data else years
+    seasonality_frame = _trim_frame(state_data, 'seasonality_percentage_normalized')
+    seasonality_years = seasonality_frame['Year'].unique().sort().to_list() if seasonality_frame.height else years
 
     seasonality_output = {
         'state': {'code': state_slug, 'name': state_name},
@@ -364,44 +325,25 @@ def _export_state_json(args: tuple) -> str:
         },
         'years': [int(y) for y in seasonality_years],
         'months': MONTH_NAMES,
-        'data': seasonality_data,
+        'data': _seasonality_rows(seasonality_frame),
         'sources': sources,
-        'generatedAt': datetime.utcnow().isoformat() + 'Z'
+        'generatedAt': generated_at
     }
 
     seasonality_filename = f'{state_slug}.json'
-    with open(seasonality_dir / seasonality_filename, 'w') as f:
-        json.dump(seasonality_output, f)
+    seasonality_payload = _encode_json(seasonality_output)
+    _write_bytes(seasonality_dir / seasonality_filename, seasonality_payload)
 
-    frontend_seasonality_dir.mkdir(parents=True, exist_ok=True)
-    with open(frontend_seasonality_dir / seasonality_filename, 'w') as f:
-        json.dump(seasonality_output, f)
-
-    public_seasonality_dir.mkdir(parents=True, exist_ok=True)
-    with open(public_seasonality_dir / seasonality_filename, 'w') as f:
-        json.dump(seasonality_output, f)
+    _write_mirror(seasonality_dir / seasonality_filename, frontend_seasonality_dir / seasonality_filename, seasonality_payload)
+    _write_mirror(seasonality_dir / seasonality_filename, public_seasonality_dir / seasonality_filename, seasonality_payload)
 
     # --- Export conception data (only if valid data exists) ---
-    valid_conception = state_data.filter(pl.col('daily_conception_rate').is_not_null())
-
-    if len(valid_conception) > 0:
-        conception_dir.mkdir(parents=True, exist_ok=True)
-        conception_years = sorted(valid_conception['Year'].unique().to_list())
-
-        conception_min_val = max(float(valid_conception['daily_conception_rate'].min()), 1e-6)
-        conception_max_val = float(valid_conception['daily_conception_rate'].max())
-
-        conception_data = []
-        for row in valid_conception.iter_rows(named=True):
-            value = row['daily_conception_rate']
-            conception_data.append({
-                'year': int(row['Year']),
-                'month': int(row['Month']),
-                'value': round(value, 2) if value is not None else None,
-                'futureBirths': int(row['future_births']) if row['future_births'] is not None else None,
-                'population': int(row['childbearing_population']) if row['childbearing_population'] is not None else None,
-                'source': row['Source']
-            })
+    if stats['conception_min'] is not None:
+        valid_conception = state_data.filter(pl.col('daily_conception_rate').is_not_null())
+        conception_years = valid_conception['Year'].unique().sort().to_list()
+
+        conception_min_val = max(float(stats['conception_min']), 1e-6)
+        conception_max_val = float(stats['conception_max'])
 
         conception_output = {
             'state': {'code': state_slug, 'name': state_name},
@@ -415,22 +357,17 @@ def _export_state_json(args: tuple) -> str:
             },
             'years': [int(y) for y in conception_years],
             'months': MONTH_NAMES,
-            'data': conception_data,
+            'data': _conception_rows(valid_conception),
             'sources': sources,
-            'generatedAt': datetime.utcnow().isoformat() + 'Z'
+            'generatedAt': generated_at
         }
 
         conception_filename = f'{state_slug}.json'
-        with open(conception_dir / conception_filename, 'w') as f:
-            json.dump(conception_output, f)
+        conception_payload = _encode_json(conception_output)
+        _write_bytes(conception_dir / conception_filename, conception_payload)
 
-        frontend_conception_dir.mkdir(parents=True, exist_ok=True)
-        with open(frontend_conception_dir / conception_filename, 'w') as f:
-            json.dump(conception_output, f)
-
-        public_conception_dir.mkdir(parents=True, exist_ok=True)
-        with open(public_conception_dir / conception_filename, 'w') as f:
-            json.dump(conception_output, f)
+        _write_mirror(conception_dir / conception_filename, frontend_conception_dir / conception_filename, conception_payload)
+        _write_mirror(conception_dir / conception_filename, public_conception_dir / conception_filename, conception_payload)
 
     return state_name
 
@@ -464,40 +401,41 @@ def export_all_states(
     # Ensure output directories exist
     ensure_output_dirs()
 
+    births = _categorize_keys(births)
+
+    # Stamp every file from this run with the same timestamp
+    generated_at = _generated_at()
+
     # Export states index and get filtered state list
-    states = export_states_index(births, output_dir, min_years, min_monthly_births)
+    states = export_states_index(births, output_dir, min_years, min_monthly_births, generated_at)
 
     # Prepare directory paths
     fertility_dir = STATES_FERTILITY_OUTPUT_DIR
     seasonality_dir = STATES_SEASONALITY_OUTPUT_DIR
     conception_dir = STATES_CONCEPTION_OUTPUT_DIR
 
-    # Convert DataFrame to dict for pickling (needed for multiprocessing)
-    births_dict = births.to_dict()
+    # Create every destination once up front rather than in each worker
+    for directory in (
+        fertility_dir, seasonality_dir, conception_dir,
+        FRONTEND_ASSETS_STATES_FERTILITY_DIR, FRONTEND_ASSETS_STATES_SEASONALITY_DIR, FRONTEND_ASSETS_STATES_CONCEPTION_DIR,
+        FRONTEND_PUBLIC_STATES_FERTILITY_DIR, FRONTEND_PUBLIC_STATES_SEASONALITY_DIR, FRONTEND_PUBLIC_STATES_CONCEPTION_DIR,
+    ):
+        directory.mkdir(parents=True, exist_ok=True)
+
+    # Each worker only receives its own state's rows, as an Arrow IPC buffer
+    state_ipc = _partition_ipc(births, states)
 
     # Create args for each state
-    export_args = [
-        (births_dict, state_name, fertility_dir, seasonality_dir, conception_dir,
-         FRONTEND_ASSETS_STATES_FERTILITY_DIR, FRONTEND_ASSETS_STATES_SEASONALITY_DIR, FRONTEND_ASSETS_STATES_CONCEPTION_DIR,
-         FRONTEND_PUBLIC_STATES_FERTILITY_DIR, FRONTEND_PUBLIC_STATES_SEASONALITY_DIR, FRONTEND_PUBLIC_STATES_CONCEPTION_DIR)
+    export_args = {
+        state_name: (
+            state_ipc[state_name], state_name, fertility_dir, seasonality_dir, conception_dir,
+            FRONTEND_ASSETS_STATES_FERTILITY_DIR, FRONTEND_ASSETS_STATES_SEASONALITY_DIR, FRONTEND_ASSETS_STATES_CONCEPTION_DIR,
+            FRONTEND_PUBLIC_STATES_FERTILITY_DIR, FRONTEND_PUBLIC_STATES_SEASONALITY_DIR, FRONTEND_PUBLIC_STATES_CONCEPTION_DIR,
+            generated_at
+        )
         for state_name in states
-    ]
-
-    # Export in parallel using threads (I/O bound)
-    print(f"Exporting JSON data for {len(states)} states using {max_workers} workers...")
-    completed = 0
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {executor.submit(_export_state_json, args): args[1] for args in export_args}
-        for future in as_completed(futures):
-            state_name = futures[future]
-            try:
-                future.result()
-                completed += 1
-                if completed % 10 == 0:
-                    print(f"  Exported {completed}/{len(states)} states...")
-            except Exception as e:
-                print(f"  Error exporting {state_name}: {e}")
-
-    print(f"\nExported data for {len(states)} states")
+    }
+
+    _run_exports(_export_state_json, export_args, max_workers, 'states', progress_every=10)
 
     return states
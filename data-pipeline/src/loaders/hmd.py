@@ -4,11 +4,37 @@ Human Mortality Database data loaders.
 These loaders make assumptions about the file structure.
 HMD files can be downloaded in bulk from the HMD website.
 """
+import os
 import polars as pl
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
 from config import HMD_DATA_DIR, HMD_COUNTRIES
+from utils import scan_csv_cached
+
+
+# Types for the columns the HMD loaders read; column order varies between countries,
+# so these are applied by name and every other column is left as a string.
+# Month and Age include 'TOT'/'UNK' rows, so they are parsed as strings.
+HMD_BIRTHS_SCHEMA = {
+    'Year': pl.Int64,
+    'Month': pl.Utf8,
+    'Births': pl.Float64,
+    'LDB': pl.Int64,
+}
+
+HMD_POPULATION_SCHEMA = {
+    'Year': pl.Int64,
+    'Month': pl.Int64,
+    'Sex': pl.Utf8,
+    'Age': pl.Utf8,
+    'Population': pl.Float64,
+    'LDB': pl.Int64,
+}
+
+# HMD marks missing values with a single '.'
+HMD_NULL_VALUES = '.'
 
 
 def get_hmd_file_path(country_code: str, file_suffix: str, data_dir: Optional[Path] = None) -> Path:
@@ -38,19 +64,29 @@ def get_hmd_file_path(country_code: str, file_suffix: str, data_dir: Optional[Pa
     return data_dir / f'{country_code}{file_suffix}'
 
 
-def load_births_file(country_code: str, data_dir: Optional[Path] = None) -> pl.DataFrame:
-    """Load raw births data for a single country from HMD."""
+def load_births_file(country_code: str, data_dir: Optional[Path] = None) -> pl.LazyFrame:
+    """Scan raw births data for a single country from HMD (via the Parquet cache)."""
     file_path = get_hmd_file_path(country_code, 'birthbymonth.txt', data_dir)
-    return pl.read_csv(file_path, infer_schema_length=100000)
+    return scan_csv_cached(
+        file_path,
+        schema_overrides=HMD_BIRTHS_SCHEMA,
+        infer_schema_length=0,
+        null_values=HMD_NULL_VALUES,
+    )
 
 
-def load_population_file(country_code: str, data_dir: Optional[Path] = None) -> pl.DataFrame:
-    """Load raw population data for a single country from HMD."""
+def load_population_file(country_code: str, data_dir: Optional[Path] = None) -> pl.LazyFrame:
+    """Scan raw population data for a single country from HMD (via the Parquet cache)."""
     file_path = get_hmd_file_path(country_code, 'pop.txt', data_dir)
-    return pl.read_csv(file_path, infer_schema_length=100000)
+    return scan_csv_cached(
+        file_path,
+        schema_overrides=HMD_POPULATION_SCHEMA,
+        infer_schema_length=0,
+        null_values=HMD_NULL_VALUES,
+    )
 
 
-def process_births_file(births: pl.DataFrame) -> pl.DataFrame:
+def process_births_file(births: pl.LazyFrame) -> pl.LazyFrame:
     """
     Process raw births data from the Human Mortality Database.
 
@@ -58,52 +94,52 @@ def process_births_file(births: pl.DataFrame) -> pl.DataFrame:
     to filter to the best source, but use data not included in the final
     life database if it's our only source.
     """
-    # Filter out totals and select needed columns
-    if not births['Month'].dtype.is_integer():
-        # Some countries only have integer months, so filtering is unnecessary
-        births = births.filter(~pl.col('Month').is_in(['TOT', 'UNK'])).with_columns(
-            pl.col('Month').cast(pl.Int64)
-        )
+    births = (
+        # Filter out totals; Month is always read as a string (see HMD_BIRTHS_SCHEMA)
+        births.filter(~pl.col('Month').is_in(['TOT', 'UNK']))
+        .with_columns(pl.col('Month').cast(pl.Int64))
+        .collect()
+    )
+
+    # Most countries have a single source for every month: nothing to choose or average
+    n_months, n_rows = births.select(pl.struct('Year', 'Month').n_unique(), pl.len()).row(0)
+    if n_months == n_rows:
+        return births.lazy().select('Year', 'Month', 'Births').sort(['Year', 'Month'])
 
+    # Keep the life-database source when a month has several, otherwise the only one;
+    # months whose sources are all outside the life database are dropped.
+    # Only rows with a births count are counted as sources.
+    is_best_source = (pl.col('LDB') == 1) | (pl.col('Births').count() <= 1)
     births = (
-        births.with_columns(
-            pl.col('Births').count().over(['Year', 'Month']).alias('n_sources')
-        )
-        .filter(
-            pl.when(pl.col('n_sources') > 1)
-            .then(pl.col('LDB') == 1)
-            .otherwise(pl.lit(True))
-        )
-        .select(
-            pl.col('Year').cast(pl.Int64),
-            pl.col('Month').cast(pl.Int64),
-            pl.col('Births').cast(pl.Float64)
-        )
+        births.lazy()
         .group_by(['Year', 'Month'])
         .agg(
             # If we still have multiple sources, average them
-            pl.col('Births').mean()
+            pl.col('Births').filter(is_best_source).mean(),
+            is_best_source.any().alias('has_source'),
         )
+        .filter('has_source')
+        .select('Year', 'Month', 'Births')
         .sort(['Year', 'Month'])
     )
     return births
 
 
-def process_population_file(population: pl.DataFrame) -> pl.DataFrame:
+def process_population_file(population: pl.LazyFrame) -> pl.LazyFrame:
     """
     Process raw population data from the Human Mortality Database.
 
     When there's more than one source per year/month/age, use the LDB flag
     to filter to the best source.
     """
-    if not population['Age'].dtype.is_integer():
-        population = population.filter(~pl.col('Age').is_in(['TOT', 'UNK'])).with_columns(
-            pl.col('Age').cast(pl.Int32)
-        )
-
+    # Sources are counted per year/month/age across both sexes, so this can't be
+    # folded into the per-sex group_by below without changing which rows survive
     population = (
-        population.with_columns(
-            pl.col('Population').count().over(['Year', 'Month', 'Age']).alias('n_sources')
+        # Filter out totals; Age is always read as a string (see HMD_POPULATION_SCHEMA)
+        population.filter(~pl.col('Age').is_in(['TOT', 'UNK']))
+        .with_columns(
+            pl.col('Age').cast(pl.Int32),
+            pl.len().over(['Year', 'Month', 'Age']).alias('n_sources'),
         )
         .filter(
             pl.when(pl.col('n_sources') > 1)
@@ -111,11 +147,11 @@ def process_population_file(population: pl.DataFrame) -> pl.DataFrame:
             .otherwise(pl.lit(True))
         )
         .select(
-            pl.col('Year').cast(pl.Int64),
-            pl.col('Month').cast(pl.Int64),  # Month refers to timing of census/survey
+            pl.col('Year'),
+            pl.col('Month'),  # Month refers to timing of census/survey
             pl.col('Sex'),
-            pl.col('Age').cast(pl.Int32),
-            pl.col('Population').cast(pl.Float64)
+            pl.col('Age'),
+            pl.col('Population'),
         )
         .group_by(['Year', 'Month', 'Sex', 'Age'])
         .agg(pl.col('Population').mean())
@@ -133,39 +169,48 @@ def filter_population_for_fertility_rate(population: pl.DataFrame) -> pl.DataFra
     Assumes we're filtering all countries at once.
     """
     return (
-        population.filter(pl.col('Sex') == 'f')
-        .filter(pl.col('Age') >= 15, pl.col('Age') <= 44)
+        # One combined mask, applied before grouping so only childbearing rows are hashed
+        population.filter(pl.col('Sex') == 'f', pl.col('Age').is_between(15, 44))
         .group_by(['Country', 'Year', 'Month'])
         .agg(pl.col('Population').sum().alias('childbearing_population'))
         .sort(['Country', 'Year', 'Month'])
     )
 
 
+def _scan_country_files(load_file, file_suffix: str, data_dir: Optional[Path] = None) -> list:
+    """
+    Scan one HMD file per country, skipping countries without data files.
+
+    Files are opened on a thread pool: on a cold cache each one is parsed from CSV,
+    which runs in polars' native code and releases the GIL.
+
+    Returns:
+        List of (Country, LazyFrame) pairs in HMD_COUNTRIES order.
+    """
+    countries = [
+        country for country in HMD_COUNTRIES
+        if get_hmd_file_path(country.code, file_suffix, data_dir).exists()
+    ]
+    if not countries:
+        return []
+    with ThreadPoolExecutor(max_workers=min(len(countries), os.cpu_count() or 1)) as pool:
+        frames = list(pool.map(lambda country: load_file(country.code, data_dir), countries))
+    return list(zip(countries, frames))
+
+
 def load_all_births(data_dir: Optional[Path] = None) -> pl.DataFrame:
     """Load and process births data for all HMD countries."""
-    births_all = []
-    for country in HMD_COUNTRIES:
-        try:
-            births = load_births_file(country.code, data_dir)
-            births = process_births_file(births)
-            births = births.with_columns(pl.lit(country.name).alias('Country'))
-            births_all.append(births)
-        except FileNotFoundError:
-            # Skip countries without data files
-            continue
-    return pl.concat(births_all) if births_all else pl.DataFrame()
+    births_all = [
+        process_births_file(births).with_columns(pl.lit(country.name).alias('Country'))
+        for country, births in _scan_country_files(load_births_file, 'birthbymonth.txt', data_dir)
+    ]
+    return pl.concat(births_all).collect(engine='streaming') if births_all else pl.DataFrame()
 
 
 def load_all_population(data_dir: Optional[Path] = None) -> pl.DataFrame:
     """Load and process population data for all HMD countries."""
-    population_all = []
-    for country in HMD_COUNTRIES:
-        try:
-            population = load_population_file(country.code, data_dir)
-            population = process_population_file(population)
-            population = population.with_columns(pl.lit(country.name).alias('Country'))
-            population_all.append(population)
-        except FileNotFoundError:
-            # Skip countries without data files
-            continue
-    return pl.concat(population_all) if population_all else pl.DataFrame()
+    population_all = [
+        process_population_file(population).with_columns(pl.lit(country.name).alias('Country'))
+        for country, population in _scan_country_files(load_population_file, 'pop.txt', data_dir)
+    ]
+    return pl.concat(population_all).collect(engine='streaming') if population_all else pl.DataFrame()
@@ -12,6 +12,15 @@ from typing import Optional
 from config import DATA_PIPELINE_ROOT
 
 
+# jpop.csv holds one column per single year of age (0-84) plus an open-ended 85+ group
+JPOP_SCHEMA = {
+    'Sex': pl.Utf8,
+    'Year': pl.Int64,
+    **{str(age): pl.Int64 for age in range(85)},
+    '85+': pl.Int64,
+}
+
+
 def load_population(data_dir: Optional[Path] = None) -> pl.DataFrame:
     """
     Load Japan population data from CSV.
@@ -26,7 +35,7 @@ def load_population(data_dir: Optional[Path] = None) -> pl.DataFrame:
         data_dir = DATA_PIPELINE_ROOT
 
     file_path = data_dir / 'jpop.csv'
-    df = pl.read_csv(file_path, infer_schema_length=100000)
+    df = pl.scan_csv(file_path, schema=JPOP_SCHEMA)
 
     # Melt from wide to long format
     df = (
@@ -49,6 +58,7 @@ def load_population(data_dir: Optional[Path] = None) -> pl.DataFrame:
         .group_by(['Country', 'Year', 'Month', 'Sex', 'Age'])
         .agg(pl.col('Population').mean())
         .sort(['Country', 'Year', 'Month', 'Sex', 'Age'])
+        .collect()
     )
     return df
 
@@ -60,8 +70,8 @@ def filter_population_for_fertility_rate(population: pl.DataFrame) -> pl.DataFra
     Returns total childbearing population by Country, Year, and Month.
     """
     return (
-        population.filter(pl.col('Sex') == 'f')
-        .filter(pl.col('Age') >= 15, pl.col('Age') <= 44)
+        # One combined mask, applied before grouping so only childbearing rows are hashed
+        population.filter(pl.col('Sex') == 'f', pl.col('Age').is_between(15, 44))
         .group_by(['Country', 'Year', 'Month'])
         .agg(pl.col('Population').sum().alias('childbearing_population'))
         .sort(['Country', 'Year', 'Month'])
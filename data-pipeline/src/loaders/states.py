@@ -13,11 +13,17 @@ but states should not be intermingled with countries in downstream processing.
 import polars as pl
 import numpy as np
 from pathlib import Path
-from typing import Optional
+from typing import Optional, TypeVar
 
 from config import STATES_DATA_DIR
 
 
+# The population steps below use only the API shared by eager and lazy frames
+FrameT = TypeVar('FrameT', pl.DataFrame, pl.LazyFrame)
+
+# Days per month in a common year; February gains a day in leap years
+DAYS_IN_MONTH = pl.Series('days_in_month', [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=pl.Int8)
+
 # FIPS code to state name mapping (for population data)
 FIPS_TO_STATE = {
     1: "Alabama", 2: "Alaska", 4: "Arizona", 5: "Arkansas", 6: "California",
@@ -34,6 +40,32 @@ FIPS_TO_STATE = {
     53: "Washington", 54: "West Virginia", 55: "Wisconsin", 56: "Wyoming",
 }
 
+# Column types for the state CSVs; columns not listed are read as strings.
+# Notes footer rows in CDC WONDER exports leave the numeric columns empty.
+CDC_WONDER_SCHEMA = {
+    'Notes': pl.Utf8,
+    'State': pl.Utf8,
+    'Year': pl.Int64,
+    'Month Code': pl.Int64,
+    'Births': pl.Float64,
+}
+
+# births is kept as a string because missing values are written as "na"
+HISTORICAL_BIRTHS_SCHEMA = {
+    'year': pl.Int64,
+    'mo': pl.Int64,
+    'state': pl.Utf8,
+    'births': pl.Utf8,
+}
+
+STATE_POPULATION_SCHEMA = {
+    'year': pl.Int64,
+    'state_name': pl.Utf8,
+    'female_15_44': pl.Float64,
+    'source': pl.Utf8,
+    'note': pl.Utf8,
+}
+
 
 def _load_cdc_wonder_file(file_path: Path) -> pl.DataFrame:
     """
@@ -45,16 +77,16 @@ def _load_cdc_wonder_file(file_path: Path) -> pl.DataFrame:
     - "Total" rows (aggregates by year/state)
     - Rows with empty Births values
     """
-    df = pl.read_csv(file_path, infer_schema_length=10000)
+    df = pl.read_csv(file_path, schema_overrides=CDC_WONDER_SCHEMA, infer_schema_length=0)
 
-    # Filter out Total rows (Notes column contains "Total")
     df = df.filter(
-        pl.col('Notes').is_null() | ~pl.col('Notes').str.contains('Total')
+        # Filter out Total rows (Notes is exactly "Total"; the query-description
+        # footer rows have no Month Code and are dropped by the next condition)
+        pl.col('Notes').ne_missing('Total'),
+        # Filter rows where Month Code is not null (excludes aggregate rows)
+        pl.col('Month Code').is_not_null(),
     )
 
-    # Filter rows where Month Code is not null (excludes aggregate rows)
-    df = df.filter(pl.col('Month Code').is_not_null())
-
     # Select and rename columns
     df = df.select(
         pl.col('State').alias('Country'),
@@ -78,20 +110,24 @@ def _load_historical_file(file_path: Path) -> pl.DataFrame:
 
     Filters out rows with "na" births.
     """
-    df = pl.read_csv(
-        file_path,
-        infer_schema_length=100000,
-    )
-
-    # Filter out rows with "na" births
-    df = df.filter(pl.col('births') != 'na')
-
-    # Select and rename columns
-    df = df.select(
-        pl.col('state').alias('Country'),
-        pl.col('year').cast(pl.Int64).alias('Year'),
-        pl.col('mo').cast(pl.Int64).alias('Month'),
-        pl.col('births').cast(pl.Float64).alias('Births'),
+    # The filter and projection are pushed into the CSV scan, so only four
+    # columns are parsed and "na" rows are dropped while reading
+    df = (
+        pl.scan_csv(
+            file_path,
+            schema_overrides=HISTORICAL_BIRTHS_SCHEMA,
+            infer_schema_length=0,
+        )
+        # Filter out rows with "na" births
+        .filter(pl.col('births') != 'na')
+        # Select and rename columns
+        .select(
+            pl.col('state').alias('Country'),
+            pl.col('year').alias('Year'),
+            pl.col('mo').alias('Month'),
+            pl.col('births').cast(pl.Float64).alias('Births'),
+        )
+        .collect(engine='streaming')
     )
 
     return df
@@ -222,7 +258,7 @@ def load_population(data_dir: Optional[Path] = None) -> pl.DataFrame:
             f"Run census-scripts/download_census_ftp.py and consolidate_female_15_44.py first."
         )
 
-    df = pl.read_csv(pop_file)
+    df = pl.read_csv(pop_file, schema_overrides=STATE_POPULATION_SCHEMA, infer_schema_length=0)
 
     # Select and rename columns to match pipeline conventions
     df = df.select(
@@ -236,7 +272,7 @@ def load_population(data_dir: Optional[Path] = None) -> pl.DataFrame:
     return df.sort(['Country', 'Year'])
 
 
-def interpolate_population(population: pl.DataFrame) -> pl.DataFrame:
+def interpolate_population(population: FrameT) -> FrameT:
     """
     Interpolate population data to fill gaps between census years.
 
@@ -244,26 +280,18 @@ def interpolate_population(population: pl.DataFrame) -> pl.DataFrame:
     census years. For 1970+ data (annual), fills any minor gaps.
 
     Args:
-        population: DataFrame with Country, Year, childbearing_population, Source
+        population: DataFrame or LazyFrame with Country, Year, childbearing_population, Source
 
     Returns:
-        DataFrame with interpolated annual population estimates.
+        Frame of the same kind with interpolated annual population estimates.
         Adds 'interpolated' column (True if value was interpolated).
     """
-    # Get year range per state
-    year_ranges = population.group_by('Country').agg([
-        pl.col('Year').min().alias('min_year'),
-        pl.col('Year').max().alias('max_year'),
-    ])
-
     # Create complete year index for each state
-    all_years = []
-    for row in year_ranges.iter_rows(named=True):
-        state = row['Country']
-        for year in range(row['min_year'], row['max_year'] + 1):
-            all_years.append({'Country': state, 'Year': year})
-
-    year_index = pl.DataFrame(all_years)
+    year_index = (
+        population.group_by('Country')
+        .agg(pl.int_range(pl.col('Year').min(), pl.col('Year').max() + 1).alias('Year'))
+        .explode('Year')
+    )
 
     # Join with actual data
     interpolated = year_index.join(
@@ -300,20 +328,21 @@ def interpolate_population(population: pl.DataFrame) -> pl.DataFrame:
         .alias('Source')
     )
 
-    return interpolated.sort(['Country', 'Year'])
+    # Already sorted by Country, Year above
+    return interpolated
 
 
-def expand_population_to_monthly(population: pl.DataFrame) -> pl.DataFrame:
+def expand_population_to_monthly(population: FrameT) -> FrameT:
     """
     Expand annual population data to monthly estimates.
 
     Uses linear interpolation between years to create monthly values.
 
     Args:
-        population: DataFrame with Country, Year, childbearing_population, Source
+        population: DataFrame or LazyFrame with Country, Year, childbearing_population, Source
 
     Returns:
-        DataFrame with columns: Country, Year, Month, childbearing_population, Source
+        Frame of the same kind with columns: Country, Year, Month, childbearing_population, Source
     """
     # Create monthly index for each state-year
     monthly = (
@@ -353,16 +382,14 @@ def load_population_monthly(data_dir: Optional[Path] = None) -> pl.DataFrame:
         DataFrame with columns: Country, Year, Month, childbearing_population, Source
         Ready for joining with births data for fertility rate computation.
     """
-    # Load raw population data
-    population = load_population(data_dir)
-
-    # Interpolate gaps
-    population = interpolate_population(population)
-
-    # Expand to monthly
-    population = expand_population_to_monthly(population)
-
-    return population
+    # Interpolate gaps, then expand to monthly, as a single query
+    return (
+        load_population(data_dir)
+        .lazy()
+        .pipe(interpolate_population)
+        .pipe(expand_population_to_monthly)
+        .collect()
+    )
 
 
 def compute_state_fertility_rates(
@@ -381,9 +408,14 @@ def compute_state_fertility_rates(
     Returns:
         DataFrame with births_per_day and daily_fertility_rate added
     """
-    # Add days_in_month to births
+    # Add days_in_month to births via a month lookup, without building dates
+    year = pl.col('Year')
+    is_leap_year = ((year % 4 == 0) & (year % 100 != 0)) | (year % 400 == 0)
     births = births.with_columns(
-        pl.date(pl.col('Year'), pl.col('Month'), 1).dt.days_in_month().alias('days_in_month')
+        (
+            pl.lit(DAYS_IN_MONTH).gather(pl.col('Month') - 1)
+            + ((pl.col('Month') == 2) & is_leap_year).cast(pl.Int8)
+        ).alias('days_in_month')
     )
 
     # Join births with population
@@ -9,7 +9,32 @@ import polars as pl
 from pathlib import Path
 from typing import Optional, List
 
-from config import UN_DATA_DIR, MONTH_NAMES_FULL, MONTH_NAME_TO_NUMBER
+from config import UN_DATA_DIR, MONTH_NAMES_FULL
+from utils import scan_csv_cached
+
+
+# The births export ends with a footnote table whose text lands in the leading
+# columns, so Year stays a string until those rows are filtered out.
+UN_BIRTHS_SCHEMA = {
+    'Country or Area': pl.Utf8,
+    'Year': pl.Utf8,
+    'Month': pl.Utf8,
+    'Reliability': pl.Utf8,
+    'Value': pl.Float64,
+}
+
+# Month names in calendar order; the physical code of each is its month number - 1.
+# Names outside the enum ('Total', 'Unknown', ...) become null when cast.
+MONTH_ENUM = pl.Enum(MONTH_NAMES_FULL)
+
+WPP_POPULATION_SCHEMA = {
+    'Location': pl.Utf8,
+    'Time': pl.Int64,
+    'AgeGrpStart': pl.Int64,
+    'AgeGrpSpan': pl.Int64,
+    'PopMale': pl.Float64,
+    'PopFemale': pl.Float64,
+}
 
 
 def load_births(data_dir: Optional[Path] = None) -> pl.DataFrame:
@@ -22,29 +47,29 @@ def load_births(data_dir: Optional[Path] = None) -> pl.DataFrame:
     if data_dir is None:
         data_dir = UN_DATA_DIR
     file_path = data_dir / 'un_births_by_month_data_raw.csv'
-    df = pl.read_csv(file_path, infer_schema_length=1000000)
-    # exclude provisional data (it's generally lower quality data)
-    df = df.filter(~pl.col('Reliability').str.contains('Provisional figure'))
-    # filter any rows where the value is 0 (results in NaN when calculating fertility rate)
-    df = df.filter(
-        pl.col('Value').cast(pl.Float64).is_not_null(), 
-        pl.col('Value').cast(pl.Float64) > 0)
-
-    # Average multiple sources per country/year/month when they exist
+    # Average multiple sources per country/year/month when they exist;
+    # the filters and column selection are pushed down into the CSV scan
     df = (
-        df.filter(pl.col('Month').str.strip_chars().is_in(MONTH_NAMES_FULL))
+        pl.scan_csv(file_path, schema_overrides=UN_BIRTHS_SCHEMA, infer_schema_length=0)
+        .with_columns(pl.col('Month').str.strip_chars().cast(MONTH_ENUM, strict=False))
+        .filter(
+            # exclude provisional data (it's generally lower quality data)
+            ~pl.col('Reliability').str.contains('Provisional figure', literal=True),
+            # filter any rows where the value is missing or 0
+            # (results in NaN when calculating fertility rate)
+            pl.col('Value') > 0,
+            pl.col('Month').is_not_null(),
+        )
         .select(
             pl.col('Country or Area').alias('Country'),
             pl.col('Year').cast(pl.Int64),
-            pl.col('Month')
-            .str.strip_chars()
-            .replace_strict(MONTH_NAME_TO_NUMBER, return_dtype=pl.Int64)
-            .alias('Month'),
-            pl.col('Value').cast(pl.Float64).alias('Births')
+            (pl.col('Month').to_physical().cast(pl.Int64) + 1).alias('Month'),
+            pl.col('Value').alias('Births'),
         )
         .group_by(['Country', 'Year', 'Month'])
         .agg(pl.col('Births').mean())
         .sort(['Country', 'Year', 'Month'])
+        .collect()
     )
     return df
 
@@ -68,8 +93,10 @@ def load_population(
     fn = 'WPP2024_PopulationBySingleAgeSex_Medium_1950-2023.csv'
     file_path = data_dir / fn
 
+    # The parsed file is cached as Parquet; only the selected columns are read
+    # from it, and rows are filtered during the scan
     df = (
-        pl.read_csv(file_path, infer_schema_length=1000000)
+        scan_csv_cached(file_path, schema_overrides=WPP_POPULATION_SCHEMA, infer_schema_length=0)
         .filter(
             pl.col('Location').is_in(births_countries),
             pl.col('AgeGrpSpan') == 1  # Only single age groups
@@ -93,6 +120,8 @@ def load_population(
             pl.col('Population') * 1000,
             pl.col('Sex').replace_strict({'PopMale': 'm', 'PopFemale': 'f'})
         )
+        .sort(['Country', 'Year', 'Month', 'Sex', 'Age'])
+        .collect()
     )
     return df
 
@@ -104,8 +133,8 @@ def filter_population_for_fertility_rate(population: pl.DataFrame) -> pl.DataFra
     Returns total childbearing population by Country, Year, and Month.
     """
     return (
-        population.filter(pl.col('Sex') == 'f')
-        .filter(pl.col('Age') >= 15, pl.col('Age') <= 44)
+        # One combined mask, applied before grouping so only childbearing rows are hashed
+        population.filter(pl.col('Sex') == 'f', pl.col('Age').is_between(15, 44))
         .group_by(['Country', 'Year', 'Month'])
         .agg(pl.col('Population').sum().alias('childbearing_population'))
         .sort(['Country', 'Year', 'Month'])
@@ -7,116 +7,72 @@ Each row represents a sex/year combination.
 """
 
 import re
+import numpy as np
 import pandas as pd
 from pathlib import Path
 
+# Patterns used by the parser, compiled once.
+# A column definition is `Name = c(...)`, possibly spanning lines; the body may hold one
+# level of nested parentheses (the Age column's sprintf call).
+_COL_BLOCK_RE = re.compile(r'(\w+)\s*=\s*c\(((?:[^()]|\([^()]*\))*)\)')
+_SPRINTF_RE = re.compile(r'sprintf\("%d",(\d+):(\d+)\)')
+_NUM_RE = re.compile(r'\b(\d+)\b')
+_COLNAME_RE = re.compile(r'^([MF])(\d+)(J?)$')
+
+
+def _parse_age_values(body):
+    """Expand the Age column body, e.g. `sprintf("%d",0:84),"85+"`, into string labels."""
+    sprintf_match = _SPRINTF_RE.search(body)
+    if not sprintf_match:
+        return _NUM_RE.findall(body)
+    start = int(sprintf_match.group(1))
+    end = int(sprintf_match.group(2))
+    age_values = [str(i) for i in range(start, end + 1)]
+    # Check for "85+" after sprintf
+    remaining = body[sprintf_match.end():]
+    if '"85+"' in remaining or "'85+'" in remaining:
+        age_values.append('85+')
+    return age_values
+
+
 def parse_r_dataframe(file_path):
     """Parse R data.frame definition and return a pandas DataFrame."""
     
     with open(file_path, 'r', encoding='utf-8') as f:
         content = f.read()
     
-    # Remove the assignment part (Jpop <- data.frame)
-    content = re.sub(r'^\w+\s*<-\s*data\.frame\s*\(', '', content, flags=re.MULTILINE)
-    content = re.sub(r'\)\s*$', '', content.strip(), flags=re.MULTILINE)
-    
-    # Dictionary to store column data
+    # Scan every column definition in one pass over the file
     columns = {}
-    
-    # Pattern to match column definitions: ColumnName = c(...)
-    # Handle multi-line c() definitions
-    column_pattern = r'(\w+)\s*=\s*c\(([^)]+(?:\)[^)]*)*)\)'
-    
-    # First, let's extract all column definitions more carefully
-    # Split by lines and process
-    lines = content.split('\n')
-    current_col = None
-    current_values = []
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-        
-        # Check if this line starts a new column definition
-        col_match = re.match(r'(\w+)\s*=\s*c\(', line)
-        if col_match:
-            # Save previous column if exists
-            if current_col:
-                columns[current_col] = current_values
-            current_col = col_match.group(1)
-            # Extract values from this line
-            values_str = line[col_match.end():]
-            current_values = []
-            # Extract numbers or strings from this line
-            if current_col == 'Age':
-                # Handle Age column specially
-                if 'sprintf' in values_str:
-                    sprintf_match = re.search(r'sprintf\("%d",(\d+):(\d+)\)', values_str)
-                    if sprintf_match:
-                        start = int(sprintf_match.group(1))
-                        end = int(sprintf_match.group(2))
-                        age_values = [str(i) for i in range(start, end + 1)]
-                        # Check for "85+" after sprintf
-                        remaining = values_str[sprintf_match.end():]
-                        if '"85+"' in remaining or "'85+'" in remaining:
-                            age_values.append('85+')
-                        columns['Age'] = age_values
-                        current_col = None
-                        current_values = []
-                        continue
-            else:
-                # Extract numbers from the line
-                numbers = re.findall(r'\b(\d+)\b', values_str)
-                current_values.extend([int(n) for n in numbers])
-        elif current_col and line.endswith(')'):
-            # Last line of a column definition
-            values_str = line.rstrip(')')
-            numbers = re.findall(r'\b(\d+)\b', values_str)
-            current_values.extend([int(n) for n in numbers])
-            columns[current_col] = current_values
-            current_col = None
-            current_values = []
-        elif current_col:
-            # Continuation line
-            numbers = re.findall(r'\b(\d+)\b', line)
-            current_values.extend([int(n) for n in numbers])
-    
-    # Save last column if exists
-    if current_col:
-        columns[current_col] = current_values
+    for match in _COL_BLOCK_RE.finditer(content):
+        name, body = match.group(1), match.group(2)
+        if name == 'Age':
+            columns['Age'] = _parse_age_values(body)
+        else:
+            columns[name] = [int(n) for n in _NUM_RE.findall(body)]
     
     # Get age headers from Age column
     age_headers = columns.pop('Age', [])
     
-    # Build the output DataFrame
-    rows = []
-    
-    for col_name, values in columns.items():
-        # Parse column name: M1888 -> sex='M', year=1888
-        match = re.match(r'^([MF])(\d+)(J?)$', col_name)
-        if match:
-            sex = match.group(1)
-            year = int(match.group(2))
-            # Create row dictionary
-            row = {'sex': sex, 'year': year}
-            # Add age group values
-            for i, age in enumerate(age_headers):
-                if i < len(values):
-                    row[age] = values[i]
-                else:
-                    row[age] = None
-            rows.append(row)
-    
-    # Create DataFrame
-    df = pd.DataFrame(rows)
-    
-    # Sort by year, then sex
-    df = df.sort_values(['year', 'sex']).reset_index(drop=True)
-    
-    # Reorder columns: sex, year, then age groups
-    col_order = ['sex', 'year'] + [str(age) for age in age_headers]
-    df = df[col_order]
+    # Build the output DataFrame from one (sex/year, age) array.
+    # Parse column names (M1888 -> sex='M', year=1888) and order rows by year, then sex.
+    matches = [m for m in map(_COLNAME_RE.match, columns) if m]
+    matches.sort(key=lambda m: (int(m.group(2)), m.group(1)))
+    n_ages = len(age_headers)
+    values = np.zeros((len(matches), n_ages), dtype=np.int64)
+    missing = np.zeros((len(matches), n_ages), dtype=bool)
+    for i, match in enumerate(matches):
+        row_values = columns[match.string][:n_ages]
+        values[i, :len(row_values)] = row_values
+        missing[i, len(row_values):] = True
+
+    df = pd.DataFrame(values, columns=age_headers)
+    # Ages missing from a short column become NaN, as they would in a dict-built frame
+    for j in np.flatnonzero(missing.any(axis=0)):
+        age = age_headers[j]
+        df[age] = df[age].astype('float64').where(~missing[:, j])
+    # Output columns: sex, year, then age groups
+    df.insert(0, 'sex', [m.group(1) for m in matches])
+    df.insert(1, 'year', [int(m.group(2)) for m in matches])
     
     return df
 
@@ -81,47 +81,50 @@ stats_output_fn = Path(__file__).parent / 'stats_heatmap_data.csv'
 # ===============================
 # LOAD PARSED DATA
 # ===============================
-def load_data():
-    births = pl.read_csv(births_fn).with_columns([
-        pl.col('Year').cast(pl.Int32),
-        pl.col('Month').cast(pl.Int8),
-        pl.col('Births').cast(pl.Float64),
-    ])
-    population = pl.read_csv(population_fn).with_columns([
-        pl.col('Year').cast(pl.Int32),
-        pl.col('Month').cast(pl.Int8),
-        pl.col('childbearing_population').cast(pl.Float64),
-    ])
+# Column types for the combined inputs; Country and Source are read as strings
+BIRTHS_INPUT_SCHEMA = {
+    'Year': pl.Int32,
+    'Month': pl.Int8,
+    'Births': pl.Float64,
+}
+
+POPULATION_INPUT_SCHEMA = {
+    'Year': pl.Int32,
+    'Month': pl.Int8,
+    'childbearing_population': pl.Float64,
+}
+
+
+def load_data() -> tuple[pl.LazyFrame, pl.LazyFrame]:
+    """Scan the combined births and population CSVs; nothing is read until collected."""
+    births = pl.scan_csv(births_fn, schema_overrides=BIRTHS_INPUT_SCHEMA)
+    population = pl.scan_csv(population_fn, schema_overrides=POPULATION_INPUT_SCHEMA)
     return births, population
 
 # ===============================
 # INTERPOLATION AND INDEXING
 # ===============================
-def interpolate_population(population: pl.DataFrame) -> pl.DataFrame:
+def interpolate_population(population: pl.LazyFrame) -> pl.LazyFrame:
     # assume we can cover entire year of any population data being present 
     #    (backfill if census/survey happened later in year)
-    country_index = population.group_by('Country').agg(
+    country_years = population.group_by('Country').agg(
         pl.int_range(pl.col('Year').min(), pl.col('Year').max() + 1).alias('Year')
-    ).with_columns(
-        pl.int_ranges(1, 13).alias('Month')
-    ).explode('Month').explode('Year').with_columns([
-        pl.col('Year').cast(pl.Int32),
-        pl.col('Month').cast(pl.Int8),
-    ]).sort('Country', 'Year', 'Month')
+    ).explode('Year').with_columns(pl.col('Year').cast(pl.Int32))
+    months = pl.LazyFrame({'Month': pl.int_range(1, 13, dtype=pl.Int8, eager=True)})
+    country_index = country_years.join(months, how='cross')
+    # one sort after the join is enough: the fills only need date order within each country
     country_index = country_index.join(population, on=['Country', 'Year', 'Month'], how='left')\
         .sort(['Country', 'Year', 'Month'])\
         .with_columns(
-            pl.col('childbearing_population').interpolate(method='linear').over(['Country']),
-            pl.col('Source').fill_null(strategy='forward').fill_null(strategy='backward').over(['Country'])
-        ).sort(['Country', 'Year', 'Month'])\
-        .with_columns(
-            pl.col('childbearing_population').fill_null(strategy='forward').fill_null(strategy='backward').over(['Country']),
+            pl.col('childbearing_population').interpolate(method='linear')
+            .fill_null(strategy='forward').fill_null(strategy='backward').over(['Country']),
+            pl.col('Source').fill_null(strategy='forward').fill_null(strategy='backward').over(['Country']),
             pl.date(pl.col('Year'), pl.col('Month'), 1).alias('Date')
         )
     return country_index
 
 
-def births_monthly_index(births: pl.DataFrame) -> pl.DataFrame:
+def births_monthly_index(births: pl.LazyFrame) -> pl.LazyFrame:
     """"""
     births_index = births.sort(['Country', 'Year', 'Month'])\
         .with_columns(
@@ -145,7 +148,7 @@ def births_monthly_index(births: pl.DataFrame) -> pl.DataFrame:
 # ===============================
 # DATA COVERAGE STATISTICS
 # ===============================
-def compute_births_extent_stats(births: pl.DataFrame) -> pl.DataFrame:
+def compute_births_extent_stats(births: pl.LazyFrame) -> pl.LazyFrame:
     """
     Compute statistics on the extent of the data (time coverage by country).
     Count number of missing periods within range as well.
@@ -157,18 +160,23 @@ def compute_births_extent_stats(births: pl.DataFrame) -> pl.DataFrame:
         pl.col('Date').count().cast(pl.Int32).alias('periods_total'),
         pl.col(births_variable).is_not_null().sum().cast(pl.Int32).alias('periods_present'),
     ).with_columns(
-        (pl.col('periods_total') - pl.col('periods_present')).cast(pl.Int32).alias('periods_missing')
-    ).with_columns(
+        (pl.col('periods_total') - pl.col('periods_present')).alias('periods_missing'),
         pl.col('earliest_date').min().over('Country').alias('earliest_date_country'),
         pl.col('latest_date').max().over('Country').alias('latest_date_country'),
-        pl.col('periods_present').sum().over('Country').cast(pl.Int32).alias('periods_present_country'),
-        pl.col('periods_total').sum().over('Country').cast(pl.Int32).alias('periods_total_country'),
-        pl.col('periods_missing').sum().over('Country').cast(pl.Int32).alias('periods_missing_country')
-    ).sort('Country', 'Source')
+        pl.col('periods_present').sum().over('Country').alias('periods_present_country'),
+        pl.col('periods_total').sum().over('Country').alias('periods_total_country'),
+        (pl.col('periods_total').sum().over('Country') - pl.col('periods_present').sum().over('Country'))
+        .alias('periods_missing_country'),
+    ).cast({
+        'periods_missing': pl.Int32,
+        'periods_present_country': pl.Int32,
+        'periods_total_country': pl.Int32,
+        'periods_missing_country': pl.Int32,
+    }).sort('Country', 'Source')
     return births_stats
 
 
-def compute_population_extent_stats(population: pl.DataFrame) -> pl.DataFrame:
+def compute_population_extent_stats(population: pl.LazyFrame) -> pl.LazyFrame:
     """
     Compute statistics on the extent of the data (time coverage by country).
     Count number of missing periods within range as well.
@@ -187,32 +195,34 @@ def compute_population_extent_stats(population: pl.DataFrame) -> pl.DataFrame:
 # ===============================
 # COMPUTE FERTILITY RATES
 # ===============================
-def compute_fertility_rates(births: pl.DataFrame, population: pl.DataFrame) -> pl.DataFrame:
+def compute_fertility_rates(births: pl.LazyFrame, population: pl.LazyFrame) -> pl.LazyFrame:
     """
     Compute fertility rates from births and population data.
     """
-    births = births.join(population, on=['Country', 'Year', 'Month'], how='left', suffix='_population')
-    births = births.with_columns(
-        (pl.col('Births') / pl.col('days_in_month')).alias('births_per_day')
+    population = population.select(
+        'Country', 'Year', 'Month', 'childbearing_population',
+        pl.col('Source').alias('Source_population'),
+        pl.col('Date').alias('Date_population'),
     )
+    births = births.join(population, on=['Country', 'Year', 'Month'], how='left', maintain_order='left', coalesce=True)
+    births_per_day = pl.col('Births') / pl.col('days_in_month')
     births = births.with_columns(
-        (pl.col('births_per_day') / pl.col('childbearing_population') * 1e5).alias('daily_fertility_rate')
-    )    
+        births_per_day.alias('births_per_day'),
+        (births_per_day / pl.col('childbearing_population') * 1e5).alias('daily_fertility_rate'),
+    )
     return births
 
 
 # ===============================
 # COMPUTE SEASONALITY
 # ===============================
-def compute_seasonality(births: pl.DataFrame) -> pl.DataFrame:
+def compute_seasonality(births: pl.LazyFrame) -> pl.LazyFrame:
     """
     Compute measures of the seasonality (i.e. monthly distribution) of births for each country.
     """
-    births_t12m_ma = births.group_by('Country', maintain_order=True).agg(        
-        pl.col('Date'),
-        pl.col('daily_fertility_rate').rolling_mean(window_size=12).alias('dfr_t12m_ma')        
-    ).explode('Date', 'dfr_t12m_ma')
-    births = births.join(births_t12m_ma, on=['Country', 'Date'], how='left')
+    births = births.with_columns(
+        pl.col('daily_fertility_rate').rolling_mean(window_size=12).over('Country').alias('dfr_t12m_ma')
+    )
     births = births.with_columns(
         # this ratio is probably not simple enough for casual viewers to understand.
         (pl.col('daily_fertility_rate') / pl.col('dfr_t12m_ma')).alias('seasonality_ratio_t12m'),
@@ -221,25 +231,25 @@ def compute_seasonality(births: pl.DataFrame) -> pl.DataFrame:
     # seasonality in terms of percentage of births in each month-- 
     #     lazier viewers can understand this more easily.
     # we need to limit this to years in which we have data for every month.
-    full_year_births = births.filter(pl.col('Month').count().over(['Country', 'Year']) == 12)
-    full_year_births = full_year_births.group_by('Country', 'Year').agg(
+    full_year_births = births.group_by('Country', 'Year').agg(
         pl.col('Births').sum().alias('annual_births'),
         pl.col('days_in_month').sum().alias('days_in_year'),
-    ).with_columns(
+        pl.col('Month').count().alias('n_months'),
+    ).filter(pl.col('n_months') == 12).with_columns(
         (pl.col('annual_births') / (pl.col('days_in_year') / 360)).alias('annual_births_normalized'),
     )
-    births_calc = births.select('Country', 'Year', 'Month', 'Births', 'days_in_month').with_columns(
-        (pl.col('Births') / (pl.col('days_in_month') / 30)).alias('births_normalized'),
+    # join both annual totals at once; normalized births use 30-day months and a 360-day year.
+    births = births.join(
+        full_year_births.select('Country', 'Year', 'annual_births', 'annual_births_normalized'),
+        on=['Country', 'Year'], how='left', maintain_order='left'
+    ).with_columns(
+        (pl.col('Births') / (pl.col('days_in_month') / 30) / pl.col('annual_births_normalized')).alias('seasonality_percentage_normalized'),
+        (pl.col('Births') / pl.col('annual_births')).alias('seasonality_percentage_annual'),
+    ).select(
+        pl.exclude('annual_births_normalized', 'annual_births', 'seasonality_percentage_annual'),
+        'annual_births',
+        'seasonality_percentage_annual',
     )
-    births_calc = births_calc.join(full_year_births.select('Country', 'Year', 'annual_births_normalized'), on=['Country', 'Year'], how='left')\
-        .with_columns(
-            (pl.col('births_normalized') / pl.col('annual_births_normalized')).alias('seasonality_percentage_normalized'),
-        )
-    births = births.join(births_calc.select('Country', 'Year', 'Month', 'seasonality_percentage_normalized'), on=['Country', 'Year', 'Month'], how='left')    
-    births = births.join(full_year_births.select('Country', 'Year', 'annual_births'), on=['Country', 'Year'], how='left')\
-        .with_columns(
-            (pl.col('Births') / pl.col('annual_births')).alias('seasonality_percentage_annual'),
-        )
     # # first, adjust the number of births in each month to a standard 30-day month.
     # full_year_births = full_year_births.with_columns(
     #     (pl.col('daily_fertility_rate') * 30).alias('fertility_rate_30d'),
@@ -277,21 +287,30 @@ def main(
     if stats_output_path is None:
         stats_output_path = stats_output_fn
     
-    # Load and process data
+    # Build the whole pipeline as lazy queries. Interpolated population, the births index and
+    # the fertility rates each feed several branches, so they are cached rather than recomputed.
     births, population = load_data()
-    population = interpolate_population(population)
+    population = interpolate_population(population).cache()
     population_stats = compute_population_extent_stats(population)
-    births = births_monthly_index(births)
+    births = births_monthly_index(births).cache()
     births_stats = compute_births_extent_stats(births)
-    stats = births_stats.join(population_stats, on=['Country', 'Source'], how='left', suffix='_population')
-    births = compute_fertility_rates(births, population)
+    stats = births_stats.join(population_stats, on=['Country', 'Source'], how='left', maintain_order='left', suffix='_population')
+    births = compute_fertility_rates(births, population).cache()
     births = compute_seasonality(births)
-    
-    # Validate dataframes against schemas before saving
+
+    # Check the queries against the schemas before running them. On LazyFrames pandera
+    # checks column names and dtypes only, so a schema mismatch fails before any data is read.
     births = BirthsSchema.validate(births)
     population = PopulationSchema.validate(population)
     stats = StatsSchema.validate(stats)
-    
+
+    births, population, stats = pl.collect_all([births, population, stats], engine='streaming')
+
+    # Validate the collected frames, which also runs the row-level (nullability) checks
+    births = BirthsSchema.validate(births)
+    population = PopulationSchema.validate(population)
+    stats = StatsSchema.validate(stats)
+
     # Write output data to CSV files
     births.write_csv(births_output_path)
     population.write_csv(population_output_path)
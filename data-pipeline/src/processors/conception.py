@@ -28,35 +28,50 @@ def compute_conception_rates(births: pl.DataFrame) -> pl.DataFrame:
         and daily_conception_rate columns added. Rows without future births
         will have null values in these columns.
     """
-    # Create a copy of births with shifted Year/Month to represent where these births
-    # would align as "future births" relative to conception date.
-    # Subtract 10 months: if births are in Jan 2021, conception was ~Mar 2020
-    future_births = births.select([
-        'Country',
-        # Calculate conception year/month (10 months before birth)
-        ((pl.col('Year') * 12 + pl.col('Month') - 1 - 10) // 12).cast(pl.Int64).alias('conception_year'),
-        ((pl.col('Year') * 12 + pl.col('Month') - 1 - 10) % 12 + 1).cast(pl.Int64).alias('conception_month'),
-        pl.col('Births').alias('future_births'),
-        pl.col('days_in_month').alias('future_days_in_month'),
-    ])
-
-    # Join births with future births data.
-    # This aligns each row with the births that will occur 10 months later.
-    births = births.join(
-        future_births,
-        left_on=['Country', 'Year', 'Month'],
-        right_on=['Country', 'conception_year', 'conception_month'],
-        how='left'
-    )
+    month_index = pl.col('Year').cast(pl.Int32) * 12 + pl.col('Month').cast(pl.Int32)
+    is_monthly_series = births.select(
+        (month_index.diff().over('Country').fill_null(1) == 1).all()
+    ).item()
 
-    # Compute future births per day
-    births = births.with_columns(
-        (pl.col('future_births') / pl.col('future_days_in_month')).alias('future_births_per_day')
-    )
+    if is_monthly_series:
+        # Every country is a gapless series in date order (the usual case after
+        # create_births_monthly_index), so births 10 months later are 10 rows down.
+        births = births.with_columns(
+            pl.col('Births').shift(-10).over('Country').alias('future_births'),
+            pl.col('days_in_month').shift(-10).over('Country').alias('future_days_in_month'),
+        )
+    else:
+        # Otherwise create a copy of births with shifted Year/Month to represent where these
+        # births would align as "future births" relative to conception date.
+        # Subtract 10 months: if births are in Jan 2021, conception was ~Mar 2020
+        # The keys are cast back to the Year/Month dtypes of the input so the join doesn't
+        # need to upcast.
+        conception_index = month_index - 1 - 10
+        schema = births.schema
+        future_births = births.select([
+            'Country',
+            # Calculate conception year/month (10 months before birth)
+            (conception_index // 12).cast(schema['Year']).alias('conception_year'),
+            (conception_index % 12 + 1).cast(schema['Month']).alias('conception_month'),
+            pl.col('Births').alias('future_births'),
+            pl.col('days_in_month').alias('future_days_in_month'),
+        ])
+
+        # Join births with future births data.
+        # This aligns each row with the births that will occur 10 months later.
+        births = births.join(
+            future_births,
+            left_on=['Country', 'Year', 'Month'],
+            right_on=['Country', 'conception_year', 'conception_month'],
+            how='left'
+        )
 
-    # Compute daily conception rate (per 100k women of childbearing age)
+    # Compute future births per day and daily conception rate
+    # (per 100k women of childbearing age) in one pass
+    future_births_per_day = pl.col('future_births') / pl.col('future_days_in_month')
     births = births.with_columns(
-        (pl.col('future_births_per_day') / pl.col('childbearing_population') * 1e5).alias('daily_conception_rate')
+        future_births_per_day.alias('future_births_per_day'),
+        (future_births_per_day / pl.col('childbearing_population') * 1e5).alias('daily_conception_rate'),
     )
 
     return births
@@ -19,22 +19,25 @@ def compute_fertility_rates(births: pl.DataFrame, population: pl.DataFrame) -> p
     Returns:
         DataFrame with births_per_day and daily_fertility_rate added
     """
-    # Join births with population
+    # Join births with population, bringing over only the population columns the
+    # output schema keeps (Source and Date renamed so they don't clash with births)
     births = births.join(
-        population,
+        population.select(
+            'Country', 'Year', 'Month', 'childbearing_population',
+            pl.col('Source').alias('Source_population'),
+            pl.col('Date').alias('Date_population'),
+        ),
         on=['Country', 'Year', 'Month'],
         how='left',
-        suffix='_population'
+        coalesce=True
     )
 
-    # Compute births per day
+    # Compute births per day and daily fertility rate (per 100k women of childbearing age)
+    # in one pass; the rate reuses the births-per-day expression instead of the new column
+    births_per_day = pl.col('Births') / pl.col('days_in_month')
     births = births.with_columns(
-        (pl.col('Births') / pl.col('days_in_month')).alias('births_per_day')
-    )
-
-    # Compute daily fertility rate (per 100k women of childbearing age)
-    births = births.with_columns(
-        (pl.col('births_per_day') / pl.col('childbearing_population') * 1e5).alias('daily_fertility_rate')
+        births_per_day.alias('births_per_day'),
+        (births_per_day / pl.col('childbearing_population') * 1e5).alias('daily_fertility_rate'),
     )
 
     return births
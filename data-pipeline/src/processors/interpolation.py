@@ -6,6 +6,9 @@ monthly estimates for fertility rate calculations.
 """
 import polars as pl
 
+# Calendar months, crossed with each country's years to build the monthly index
+MONTHS = pl.DataFrame({'Month': pl.int_range(1, 13, dtype=pl.Int8, eager=True)})
+
 
 def interpolate_population(population: pl.DataFrame) -> pl.DataFrame:
     """
@@ -23,31 +26,25 @@ def interpolate_population(population: pl.DataFrame) -> pl.DataFrame:
     Returns:
         DataFrame with monthly population estimates
     """
-    # Create full monthly index for each country
-    country_index = (
+    # Create full monthly index for each country: one row per year, crossed with the 12 months
+    country_years = (
         population.group_by('Country')
         .agg(pl.int_range(pl.col('Year').min(), pl.col('Year').max() + 1).alias('Year'))
-        .with_columns(pl.int_ranges(1, 13).alias('Month'))
-        .explode('Month')
         .explode('Year')
-        .with_columns([
-            pl.col('Year').cast(pl.Int32),
-            pl.col('Month').cast(pl.Int8),
-        ])
-        .sort('Country', 'Year', 'Month')
+        .with_columns(pl.col('Year').cast(pl.Int32))
     )
+    country_index = country_years.join(MONTHS, how='cross')
 
-    # Join with actual data and interpolate
+    # Join with actual data and interpolate; sort once, since the fills below
+    # only need each country's rows in date order and don't reorder rows
     country_index = (
         country_index.join(population, on=['Country', 'Year', 'Month'], how='left')
         .sort(['Country', 'Year', 'Month'])
         .with_columns(
-            pl.col('childbearing_population').interpolate(method='linear').over(['Country']),
-            pl.col('Source').fill_null(strategy='forward').fill_null(strategy='backward').over(['Country'])
-        )
-        .sort(['Country', 'Year', 'Month'])
-        .with_columns(
-            pl.col('childbearing_population').fill_null(strategy='forward').fill_null(strategy='backward').over(['Country']),
+            # Interpolate between data points, then extend the first/last values to the ends
+            pl.col('childbearing_population').interpolate(method='linear')
+            .fill_null(strategy='forward').fill_null(strategy='backward').over(['Country']),
+            pl.col('Source').fill_null(strategy='forward').fill_null(strategy='backward').over(['Country']),
             pl.date(pl.col('Year'), pl.col('Month'), 1).alias('Date')
         )
     )
@@ -24,18 +24,11 @@ def compute_seasonality(births: pl.DataFrame) -> pl.DataFrame:
     Returns:
         DataFrame with seasonality metrics added
     """
-    # Compute 12-month trailing moving average
-    births_t12m_ma = (
-        births.group_by('Country', maintain_order=True)
-        .agg(
-            pl.col('Date'),
-            pl.col('daily_fertility_rate').rolling_mean(window_size=12).alias('dfr_t12m_ma')
-        )
-        .explode('Date', 'dfr_t12m_ma')
+    # Compute 12-month trailing moving average over each country's rows in date order
+    births = births.with_columns(
+        pl.col('daily_fertility_rate').rolling_mean(window_size=12).over('Country').alias('dfr_t12m_ma')
     )
 
-    births = births.join(births_t12m_ma, on=['Country', 'Date'], how='left')
-
     # Compute seasonality ratios
     births = births.with_columns(
         # Ratio to 12-month trailing moving average
@@ -45,60 +38,41 @@ def compute_seasonality(births: pl.DataFrame) -> pl.DataFrame:
     )
 
     # Compute seasonality percentage (only for complete years)
-    # First, identify years with all 12 months of data
-    full_year_births = births.filter(
-        pl.col('Month').count().over(['Country', 'Year']) == 12
-    )
-
+    # Annual totals are aggregated per year and kept only for years with all 12 months of data
     full_year_births = (
-        full_year_births.group_by('Country', 'Year')
+        births.group_by('Country', 'Year')
         .agg(
             pl.col('Births').sum().alias('annual_births'),
             pl.col('days_in_month').sum().alias('days_in_year'),
+            pl.col('Month').count().alias('n_months'),
         )
+        .filter(pl.col('n_months') == 12)
         .with_columns(
             # Normalize to 360-day year
             (pl.col('annual_births') / (pl.col('days_in_year') / 360)).alias('annual_births_normalized'),
         )
     )
 
-    # Compute normalized births (30-day months)
-    births_calc = (
-        births.select('Country', 'Year', 'Month', 'Births', 'days_in_month')
-        .with_columns(
-            (pl.col('Births') / (pl.col('days_in_month') / 30)).alias('births_normalized'),
-        )
-    )
-
-    # Join and compute normalized seasonality percentage
-    births_calc = (
-        births_calc.join(
-            full_year_births.select('Country', 'Year', 'annual_births_normalized'),
-            on=['Country', 'Year'],
-            how='left'
-        )
-        .with_columns(
-            (pl.col('births_normalized') / pl.col('annual_births_normalized')).alias('seasonality_percentage_normalized'),
-        )
-    )
-
-    # Add normalized percentage to main dataframe
-    births = births.join(
-        births_calc.select('Country', 'Year', 'Month', 'seasonality_percentage_normalized'),
-        on=['Country', 'Year', 'Month'],
-        how='left'
-    )
-
-    # Add simple annual percentage
+    # Join both annual totals at once and compute the percentages in a single pass:
+    # normalized births (30-day months) over the 360-day annual total, and births over
+    # the simple annual total
     births = (
         births.join(
-            full_year_births.select('Country', 'Year', 'annual_births'),
+            full_year_births.select('Country', 'Year', 'annual_births', 'annual_births_normalized'),
             on=['Country', 'Year'],
             how='left'
         )
         .with_columns(
+            (pl.col('Births') / (pl.col('days_in_month') / 30) / pl.col('annual_births_normalized'))
+            .alias('seasonality_percentage_normalized'),
             (pl.col('Births') / pl.col('annual_births')).alias('seasonality_percentage_annual'),
         )
+        # Drop the helper total and keep the output column order of the CSV exports
+        .select(
+            pl.exclude('annual_births_normalized', 'annual_births', 'seasonality_percentage_annual'),
+            'annual_births',
+            'seasonality_percentage_annual',
+        )
     )
 
     return births
@@ -24,16 +24,23 @@ def compute_births_extent_stats(births: pl.DataFrame) -> pl.DataFrame:
             pl.col('Date').count().cast(pl.Int32).alias('periods_total'),
             pl.col('Births').is_not_null().sum().cast(pl.Int32).alias('periods_present'),
         )
+        # One projection: missing periods per source and the country-level totals, with
+        # the country's missing periods derived from its total and present sums
         .with_columns(
-            (pl.col('periods_total') - pl.col('periods_present')).cast(pl.Int32).alias('periods_missing')
-        )
-        .with_columns(
+            (pl.col('periods_total') - pl.col('periods_present')).alias('periods_missing'),
             pl.col('earliest_date').min().over('Country').alias('earliest_date_country'),
             pl.col('latest_date').max().over('Country').alias('latest_date_country'),
-            pl.col('periods_present').sum().over('Country').cast(pl.Int32).alias('periods_present_country'),
-            pl.col('periods_total').sum().over('Country').cast(pl.Int32).alias('periods_total_country'),
-            pl.col('periods_missing').sum().over('Country').cast(pl.Int32).alias('periods_missing_country')
+            pl.col('periods_present').sum().over('Country').alias('periods_present_country'),
+            pl.col('periods_total').sum().over('Country').alias('periods_total_country'),
+            (pl.col('periods_total').sum().over('Country') - pl.col('periods_present').sum().over('Country'))
+            .alias('periods_missing_country'),
         )
+        .cast({
+            'periods_missing': pl.Int32,
+            'periods_present_country': pl.Int32,
+            'periods_total_country': pl.Int32,
+            'periods_missing_country': pl.Int32,
+        })
         .sort('Country', 'Source')
     )
     return births_stats
@@ -1,2 +1,4 @@
 """Utility functions for the data pipeline."""
-# Utilities can be added here as needed
+from .csv_cache import scan_csv_cached
+
+__all__ = ['scan_csv_cached']
@@ -0,0 +1,62 @@
+"""
+Parquet cache for raw CSV inputs.
+
+Parsing the HMD text files and the WPP CSV dominates loader time, so each file is
+parsed once and stored as Parquet. Later runs scan the Parquet copy instead, which
+also lets polars push filters down using row-group statistics.
+"""
+import hashlib
+import os
+from pathlib import Path
+from typing import Any, Optional
+
+import polars as pl
+
+from config import CSV_CACHE_DIR
+
+
+def get_cache_path(file_path: Path, cache_dir: Optional[Path] = None, **read_kwargs: Any) -> Path:
+    """
+    Get the cache file for a CSV read with the given options.
+
+    The name includes a hash of the source path and read options, so files with the
+    same name in different data directories, or read with a different schema, never
+    share a cache entry.
+    """
+    if cache_dir is None:
+        cache_dir = CSV_CACHE_DIR
+    key = repr((str(Path(file_path).resolve()), sorted(read_kwargs.items()), pl.__version__))
+    digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+    return cache_dir / f'{Path(file_path).stem}-{digest}.parquet'
+
+
+def scan_csv_cached(file_path: Path, cache_dir: Optional[Path] = None, **read_kwargs: Any) -> pl.LazyFrame:
+    """
+    Scan a CSV through its Parquet cache, rebuilding the cache if the CSV is newer.
+
+    Args:
+        file_path: CSV file to read.
+        cache_dir: Directory for cache files. Defaults to CSV_CACHE_DIR.
+        **read_kwargs: Options passed to pl.read_csv (schema, null values, ...).
+
+    Returns:
+        LazyFrame over the cached Parquet file, or over the CSV itself if the
+        cache can't be written.
+    """
+    file_path = Path(file_path)
+    cache_path = get_cache_path(file_path, cache_dir, **read_kwargs)
+
+    if cache_path.exists() and cache_path.stat().st_mtime >= file_path.stat().st_mtime:
+        return pl.scan_parquet(cache_path)
+
+    df = pl.read_csv(file_path, **read_kwargs)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write under a temporary name so a crash never leaves a truncated cache file
+        tmp_path = cache_path.with_name(f'{cache_path.name}.{os.getpid()}.tmp')
+        df.write_parquet(tmp_path, compression='zstd', statistics=True)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # Read-only or missing cache location; fall back to the parsed CSV
+        return df.lazy()
+    return pl.scan_parquet(cache_path)
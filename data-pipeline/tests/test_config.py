@@ -1,4 +1,5 @@
 """Tests for the config module."""
+import re
 import pytest
 from config import (
     MONTH_NAMES,
@@ -6,6 +7,7 @@ from config import (
     MONTH_NAME_TO_NUMBER,
     DATA_SOURCE_LABELS,
     HMD_COUNTRIES,
+    strip_country_name,
     normalize_country_name,
     get_country_slug,
 )
@@ -86,6 +88,17 @@ class TestNormalizeCountryName:
         result = normalize_country_name("Côte d'Ivoire")
         assert '-' in result or result.isalpha()
 
+    def test_ascii_fast_path_matches_regex(self):
+        """ASCII names should normalize exactly as the regex path would."""
+        name = "St. Kitts & Nevis\t(1990-2000) d'Ivoire_X"
+        expected = re.sub(r'[^a-zA-Z\s]', '', name).replace(' ', '-').lower()
+        assert normalize_country_name(name) == expected
+
+    def test_strip_keeps_case(self):
+        """strip_country_name should clean the name like normalize_country_name without lowercasing."""
+        assert strip_country_name("St. Kitts & Nevis") == 'St-Kitts--Nevis'
+        assert strip_country_name("Côte d'Ivoire").lower() == normalize_country_name("Côte d'Ivoire")
+
     def test_get_country_slug(self):
         """get_country_slug should return normalized name."""
         slug = get_country_slug('United States of America')
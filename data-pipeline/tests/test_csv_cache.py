@@ -0,0 +1,49 @@
+"""Tests for the Parquet cache used by the CSV loaders."""
+import os
+
+import polars as pl
+
+from utils.csv_cache import get_cache_path, scan_csv_cached
+
+
+SCHEMA = {'Year': pl.Int64, 'Births': pl.Float64}
+
+
+class TestScanCsvCached:
+    """Tests for scan_csv_cached."""
+
+    def test_reads_through_cache(self, tmp_path):
+        """First read should write the cache; later reads should return the same data."""
+        csv_path = tmp_path / 'births.csv'
+        csv_path.write_text('Year,Births\n2020,1.5\n2021,.\n')
+        cache_dir = tmp_path / 'cache'
+
+        first = scan_csv_cached(csv_path, cache_dir, schema_overrides=SCHEMA, null_values='.').collect()
+        cache_path = get_cache_path(csv_path, cache_dir, schema_overrides=SCHEMA, null_values='.')
+        assert cache_path.exists()
+
+        second = scan_csv_cached(csv_path, cache_dir, schema_overrides=SCHEMA, null_values='.').collect()
+        assert first.equals(second)
+        assert second['Births'].to_list() == [1.5, None]
+
+    def test_rebuilds_when_source_is_newer(self, tmp_path):
+        """A CSV modified after the cache was written should be parsed again."""
+        csv_path = tmp_path / 'births.csv'
+        csv_path.write_text('Year,Births\n2020,1.5\n')
+        cache_dir = tmp_path / 'cache'
+        scan_csv_cached(csv_path, cache_dir, schema_overrides=SCHEMA).collect()
+
+        csv_path.write_text('Year,Births\n2020,2.5\n')
+        cache_mtime = get_cache_path(csv_path, cache_dir, schema_overrides=SCHEMA).stat().st_mtime
+        os.utime(csv_path, (cache_mtime + 10, cache_mtime + 10))
+
+        df = scan_csv_cached(csv_path, cache_dir, schema_overrides=SCHEMA).collect()
+        assert df['Births'].to_list() == [2.5]
+
+    def test_read_options_use_separate_entries(self, tmp_path):
+        """Reading the same file with different options should not share a cache file."""
+        csv_path = tmp_path / 'births.csv'
+        csv_path.write_text('Year,Births\n2020,1.5\n')
+        cache_dir = tmp_path / 'cache'
+
+        assert get_cache_path(csv_path, cache_dir, schema_overrides=SCHEMA) != get_cache_path(csv_path, cache_dir)
@@ -18,9 +18,12 @@ from exporters import (
     export_conception_data,
     export_all_countries,
     compute_complete_years,
+    compute_complete_years_by_country,
     filter_countries_by_min_years,
     trim_leading_trailing_nulls,
 )
+from exporters.common import _trim_frame, _seasonality_rows
+from exporters.states_exporter import filter_states
 
 
 @pytest.fixture
@@ -243,6 +246,11 @@ class TestComputeCompleteYears:
         """Should return 0 for a country not in the data."""
         assert compute_complete_years(sample_births_data, 'UnknownCountry') == 0
 
+    def test_counts_all_countries_at_once(self, sample_births_partial_years):
+        """Should return complete year counts for every country in one call."""
+        result = compute_complete_years_by_country(sample_births_partial_years)
+        assert result == {'CountryA': 3, 'CountryB': 1}
+
 
 class TestFilterCountriesByMinYears:
     """Tests for country filtering by minimum years."""
@@ -271,6 +279,29 @@ class TestFilterCountriesByMinYears:
         assert len(excluded) == 2
 
 
+class TestFilterStates:
+    """Tests for the combined state filters."""
+
+    def test_applies_years_then_births(self, sample_births_partial_years):
+        """Years failures are reported first; births only checked for the rest."""
+        included, by_years, by_births = filter_states(
+            sample_births_partial_years, min_years=2, min_monthly_births=20000
+        )
+
+        assert included == []
+        assert by_years == [('CountryB', 1)]
+        assert by_births == [('CountryA', 10000)]
+
+    def test_includes_states_passing_both(self, sample_births_partial_years):
+        """States meeting both thresholds are included in alphabetical order."""
+        included, by_years, by_births = filter_states(
+            sample_births_partial_years, min_years=1, min_monthly_births=5000
+        )
+
+        assert included == ['CountryA', 'CountryB']
+        assert by_years == [] and by_births == []
+
+
 class TestExportCountriesIndexWithMinYears:
     """Tests for countries index export with min_years filtering."""
 
@@ -448,3 +479,43 @@ class TestTrimLeadingTrailingNulls:
         assert len(result) == 2
         assert result[0]['month'] == 2
         assert result[1]['month'] == 3
+
+
+class TestTrimFrame:
+    """Tests for the frame-level trim used before building data rows."""
+
+    def test_sorts_then_trims_both_ends(self):
+        """Should sort by year/month and keep only the span between valid values."""
+        frame = pl.DataFrame({
+            'Year': [2020, 2020, 2020, 2020, 2020],
+            'Month': [5, 1, 3, 2, 4],
+            'value': [None, None, None, 5.0, 6.0],
+        })
+        result = _trim_frame(frame, 'value')
+        assert result['Month'].to_list() == [2, 3, 4]
+        assert result['value'].to_list() == [5.0, None, 6.0]
+
+    def test_handles_all_nulls(self):
+        """Should return an empty frame with the same columns when all values are null."""
+        frame = pl.DataFrame({'Year': [2020, 2020], 'Month': [1, 2], 'value': [None, None]},
+                             schema_overrides={'value': pl.Float64})
+        result = _trim_frame(frame, 'value')
+        assert result.height == 0
+        assert result.columns == frame.columns
+
+
+class TestSeasonalityRows:
+    """Tests for building seasonality data cells."""
+
+    def test_formatted_value_matches_python_rounding(self):
+        """formattedValue should round ties like f"{x * 100:.1f}%", not like Polars' round()."""
+        values = [0.0545, 0.08333, 0.1, None]
+        frame = pl.DataFrame({
+            'Year': [2020] * 4,
+            'Month': [1, 2, 3, 4],
+            'seasonality_percentage_normalized': values,
+            'Source': ['HMD'] * 4,
+        })
+        rows = _seasonality_rows(frame)
+        assert [row['formattedValue'] for row in rows] == ['5.5%', '8.3%', '10.0%', None]
+        assert [row['value'] for row in rows] == [0.0545, 0.0833, 0.1, None]
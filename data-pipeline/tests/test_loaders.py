@@ -0,0 +1,30 @@
+"""Tests for the loaders module."""
+import polars as pl
+
+from loaders.hmd import process_births_file
+
+
+class TestProcessBirthsFile:
+    """Tests for choosing the HMD births source per month."""
+
+    def test_prefers_life_database_source(self):
+        """Should keep the LDB=1 row when a month has several sources."""
+        births = pl.LazyFrame({
+            'Year': [2000, 2000],
+            'Month': ['1', '1'],
+            'Births': [90.0, 100.0],
+            'LDB': [0, 1],
+        })
+        result = process_births_file(births).collect()
+        assert result.rows() == [(2000, 1, 100.0)]
+
+    def test_null_rows_do_not_count_as_sources(self):
+        """A month with one non-null source outside the life database is kept."""
+        births = pl.LazyFrame({
+            'Year': [2000, 2000, 2000],
+            'Month': ['1', '1', '2'],
+            'Births': [None, 100.0, 110.0],
+            'LDB': [0, 0, 1],
+        }, schema_overrides={'Births': pl.Float64})
+        result = process_births_file(births).collect()
+        assert result.rows() == [(2000, 1, 100.0), (2000, 2, 110.0)]
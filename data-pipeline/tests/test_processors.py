@@ -213,3 +213,20 @@ class TestComputeConceptionRates:
 
         # All should have null conception rate
         assert france_late_2021['daily_conception_rate'].is_null().all()
+
+    def test_future_births_align_across_gaps(self, sample_births_data, sample_population_data):
+        """Future births should come from 10 calendar months later even if months are missing."""
+        births = create_births_monthly_index(sample_births_data)
+        population = interpolate_population(sample_population_data)
+        births = compute_fertility_rates(births, population)
+        # Drop France Jun 2020 so rows no longer line up with calendar months
+        births = births.filter(
+            ~((pl.col('Country') == 'France') & (pl.col('Year') == 2020) & (pl.col('Month') == 6))
+        )
+        result = compute_conception_rates(births)
+
+        france = result.filter(pl.col('Country') == 'France')
+        for month in (1, 2):
+            row = france.filter((pl.col('Year') == 2020) & (pl.col('Month') == month))
+            target = france.filter((pl.col('Year') == 2020) & (pl.col('Month') == month + 10))
+            assert row['future_births'][0] == target['Births'][0]